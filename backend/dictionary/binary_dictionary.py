@@ -0,0 +1,289 @@
+"""Compact memory-mapped binary form of word_dictionary.json.
+
+build_dictionary.py writes word_dictionary.bin next to the JSON. Readers open
+it with mmap and decode words and clues only when asked, so loading the
+dictionary costs a header parse instead of a full JSON parse.
+
+Layout (little-endian):
+
+    header      <4sHHIIIIQ: magic, version, word width, word count,
+                meta length, clue heap length, source size, source mtime_ns
+    meta        UTF-8 JSON: exam names, tag names, dictionary metadata
+    words       count * width bytes, ASCII, NUL-padded, sorted
+    levels      count * uint8 (0 = no level)
+    flags       count * uint8 (bit 0 = excludeDefault)
+    exams       count * uint16 bitmask over meta["exams"]
+    tags        count * uint16 bitmask over meta["tags"]
+    clues       count * 3 * uint32 heap offsets (easy, medium, hard),
+                NO_CLUE where the word has no clue at that difficulty
+    clue heap   records of en + NUL + zh + NUL, identical records shared
+
+The source size and mtime recorded in the header let readers detect that
+the JSON was edited after the binary was written and fall back to it.
+"""
+
+import json
+import mmap
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+
+MAGIC = b"CWDB"
+VERSION = 2
+HEADER = struct.Struct("<4sHHIIIIQ")
+DIFFICULTIES = ("easy", "medium", "hard")
+FLAG_EXCLUDE_DEFAULT = 1
+NO_CLUE = 0xFFFFFFFF
+
+
+def write_binary_dictionary(dictionary, path, source_path=None):
+    """Write the {"metadata", "words"} dictionary structure to path.
+
+    source_path is the JSON file the binary mirrors; its size and mtime are
+    recorded so readers can tell when the binary is stale.
+    """
+    words = dictionary.get("words", {})
+    keys = sorted(words)
+    width = max((len(k) for k in keys), default=1)
+    exams = sorted({e for entry in words.values() for e in entry.get("exams", [])})
+    tags = sorted({t for entry in words.values() for t in entry.get("tags", [])})
+    if len(exams) > 16 or len(tags) > 16:
+        raise ValueError("Binary dictionary supports at most 16 exams and 16 tags")
+    exam_bit = {e: 1 << i for i, e in enumerate(exams)}
+    tag_bit = {t: 1 << i for i, t in enumerate(tags)}
+
+    meta = json.dumps({
+        "exams": exams,
+        "tags": tags,
+        "metadata": dictionary.get("metadata", {}),
+    }, ensure_ascii=False).encode("utf-8")
+
+    table = bytearray()
+    levels = bytearray()
+    flags = bytearray()
+    exam_masks = []
+    tag_masks = []
+    clue_offsets = []
+    heap = bytearray()
+    records = {}
+    for key in keys:
+        entry = words[key]
+        table += key.encode("ascii").ljust(width, b"\0")
+        levels.append(entry.get("level") or 0)
+        flags.append(FLAG_EXCLUDE_DEFAULT if entry.get("excludeDefault") else 0)
+        exam_masks.append(sum(exam_bit[e] for e in set(entry.get("exams", []))))
+        tag_masks.append(sum(tag_bit[t] for t in set(entry.get("tags", []))))
+        clues = entry.get("clues", {})
+        for difficulty in DIFFICULTIES:
+            clue = clues.get(difficulty)
+            if not clue:
+                clue_offsets.append(NO_CLUE)
+                continue
+            record = (clue.get("en", "") + "\0" + clue.get("zh", "") + "\0").encode("utf-8")
+            offset = records.get(record)
+            if offset is None:
+                offset = records[record] = len(heap)
+                heap += record
+            clue_offsets.append(offset)
+
+    source_size = source_mtime = 0
+    if source_path is not None:
+        st = Path(source_path).stat()
+        source_size, source_mtime = st.st_size, st.st_mtime_ns
+
+    count = len(keys)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, width, count, len(meta), len(heap),
+                            source_size, source_mtime))
+        f.write(meta)
+        f.write(table)
+        f.write(levels)
+        f.write(flags)
+        f.write(struct.pack(f"<{count}H", *exam_masks))
+        f.write(struct.pack(f"<{count}H", *tag_masks))
+        f.write(struct.pack(f"<{count * 3}I", *clue_offsets))
+        f.write(heap)
+
+
+class BinaryDictionary(Mapping):
+    """Read-only view of a binary dictionary, mapping WORD -> entry dict.
+
+    Entries are decoded on access into the same shape as the JSON "words"
+    values, so code written against the JSON keeps working.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f"Not a binary dictionary: {self.path}")
+        (magic, version, self.width, self.count, meta_len, heap_len,
+         self.source_size, self.source_mtime) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a binary dictionary (v{VERSION}): {self.path}")
+        pos = HEADER.size
+        meta = json.loads(self._mm[pos:pos + meta_len].decode("utf-8"))
+        self.exam_names = meta["exams"]
+        self.tag_names = meta["tags"]
+        self.metadata = meta["metadata"]
+        pos += meta_len
+        count = self.count
+        self._words_at = pos
+        pos += count * self.width
+        self._levels_at = pos
+        pos += count
+        self._flags_at = pos
+        pos += count
+        self._exams_at = pos
+        pos += 2 * count
+        self._tags_at = pos
+        pos += 2 * count
+        self._clues_at = pos
+        pos += 12 * count
+        self._heap_at = pos
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def is_fresh(self, source_path):
+        """True if source_path is unchanged since this binary was written."""
+        try:
+            st = Path(source_path).stat()
+        except OSError:
+            return True
+        return (st.st_size, st.st_mtime_ns) == (self.source_size, self.source_mtime)
+
+    # Column access by row number (rows are in sorted word order).
+
+    def word(self, i):
+        start = self._words_at + i * self.width
+        return self._mm[start:start + self.width].rstrip(b"\0").decode("ascii")
+
+    def level(self, i):
+        return self._mm[self._levels_at + i] or None
+
+    def exclude_default(self, i):
+        return bool(self._mm[self._flags_at + i] & FLAG_EXCLUDE_DEFAULT)
+
+    def exam_mask(self, i):
+        return struct.unpack_from("<H", self._mm, self._exams_at + 2 * i)[0]
+
+    def tag_mask(self, i):
+        return struct.unpack_from("<H", self._mm, self._tags_at + 2 * i)[0]
+
+    def exams(self, i):
+        mask = self.exam_mask(i)
+        return [e for b, e in enumerate(self.exam_names) if mask >> b & 1]
+
+    def tags(self, i):
+        mask = self.tag_mask(i)
+        return [t for b, t in enumerate(self.tag_names) if mask >> b & 1]
+
+    def clue(self, i, difficulty="easy"):
+        """Return {"en", "zh"} for row i at difficulty, or None if it has no clue."""
+        slot = DIFFICULTIES.index(difficulty)
+        offset = struct.unpack_from("<I", self._mm, self._clues_at + 4 * (3 * i + slot))[0]
+        if offset == NO_CLUE:
+            return None
+        start = self._heap_at + offset
+        mid = self._mm.find(b"\0", start)
+        end = self._mm.find(b"\0", mid + 1)
+        return {
+            "en": self._mm[start:mid].decode("utf-8"),
+            "zh": self._mm[mid + 1:end].decode("utf-8"),
+        }
+
+    def find(self, word):
+        """Return the row of word (binary search), or -1."""
+        target = word.encode("ascii", "replace")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._words_at + mid * self.width
+            probe = self._mm[start:start + self.width].rstrip(b"\0")
+            if probe < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self.word(lo) == word:
+            return lo
+        return -1
+
+    def scan(self):
+        """Yield (word, level, exclude_default, tags) for every row.
+
+        Columns are sliced in bulk, which is much cheaper than per-row access
+        when a caller wants to filter the whole word list.
+        """
+        mm, count, width = self._mm, self.count, self.width
+        table = mm[self._words_at:self._words_at + count * width]
+        levels = mm[self._levels_at:self._levels_at + count]
+        flags = mm[self._flags_at:self._flags_at + count]
+        tag_masks = struct.unpack_from(f"<{count}H", mm, self._tags_at)
+        names = self.tag_names
+        for i in range(count):
+            word = table[i * width:(i + 1) * width].rstrip(b"\0").decode("ascii")
+            mask = tag_masks[i]
+            tags = [t for b, t in enumerate(names) if mask >> b & 1] if mask else []
+            yield word, levels[i] or None, bool(flags[i] & FLAG_EXCLUDE_DEFAULT), tags
+
+    def entry(self, i):
+        """Decode row i into the JSON entry shape."""
+        clues = {d: self.clue(i, d) for d in DIFFICULTIES}
+        entry = {
+            "length": len(self.word(i)),
+            "clues": {d: clue for d, clue in clues.items() if clue is not None},
+        }
+        level = self.level(i)
+        if level is not None:
+            entry["level"] = level
+            entry["exams"] = self.exams(i)
+        tags = self.tags(i)
+        if tags:
+            entry["tags"] = tags
+        if self.exclude_default(i):
+            entry["excludeDefault"] = True
+        return entry
+
+    # Mapping interface
+
+    def __getitem__(self, word):
+        i = self.find(word)
+        if i < 0:
+            raise KeyError(word)
+        return self.entry(i)
+
+    def __contains__(self, word):
+        return isinstance(word, str) and self.find(word) >= 0
+
+    def __iter__(self):
+        return (self.word(i) for i in range(self.count))
+
+    def __len__(self):
+        return self.count
+
+
+def open_binary_dictionary(path, source_path=None):
+    """Open path if it exists and is not older than source_path, else None."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        binary = BinaryDictionary(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    if source_path is not None and not binary.is_fresh(source_path):
+        binary.close()
+        return None
+    return binary
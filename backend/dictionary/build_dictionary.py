@@ -1,18 +1,38 @@
 #!/usr/bin/env python3
 """
 Build word_dictionary.json for crossword generation.
+
+Every enriched word goes through the filters, the override/translation merge
+and the level merge on its own, producing a build record; plurals and
+inflected forms of known words are then dropped. The records are saved to
+build_state.json keyed by a hash of each word's inputs (its enriched entry,
+translation, override and level). With --incremental, only words whose
+inputs changed are processed again, and reused words have their duplicate
+check redone only when one of their possible base forms appeared in or
+disappeared from the source words. Any edit to this script invalidates the
+state. Each build reports the words added, removed and changed against the
+previous dictionary, and the output files are only rewritten when the
+dictionary changed.
 """
 
+import argparse
+import hashlib
 import json
+import os
 import re
 from pathlib import Path
 
+from binary_dictionary import open_binary_dictionary, write_binary_dictionary
+
 ROOT = Path(__file__).resolve().parents[2]
 OUTPUT_PATH = Path(__file__).parent / "word_dictionary.json"
+BINARY_PATH = Path(__file__).parent / "word_dictionary.bin"
 ENRICHED_PATH = ROOT / "backend" / "scripts" / "enriched_words.json"
 TRANSLATIONS_PATH = ROOT / "backend" / "scripts" / "word_translations.json"
 OVERRIDES_PATH = Path(__file__).parent / "translation_overrides.json"
 LEVELS_PATH = ROOT / "backend" / "scripts" / "word_levels.json"
+STATE_PATH = Path(__file__).parent / "build_state.json"
+STATE_VERSION = 1
 
 # Hard exclusions: never include in any dictionary output.
 HARD_EXCLUDED = {
@@ -109,6 +129,76 @@ SOFT_EXCLUDED = {
     "shall":    {"tags": ["formal"]},
 }
 
+# Standalone words that happen to look like inflections — never remove these.
+INFLECTION_SAFELIST = {
+    # -ING words that are standalone nouns/adjectives
+    "AMAZING", "BINDING", "BLESSING", "BORING", "BUILDING", "CEILING",
+    "CLOTHING", "COATING", "COMING", "CUNNING", "CUTTING", "DARLING",
+    "DRAWING", "DWELLING", "EARNING", "EVENING", "EXCITING", "FEELING",
+    "FILLING", "FINDING", "FITTING", "BLESSING", "GAMBLING", "GREETING",
+    "GROUNDING", "HEADING", "HEARING", "HIDING", "HIKING", "HOLDING",
+    "HOUSING", "HUNTING", "KILLING", "KNITTING", "LANDING", "LASTING",
+    "LEADING", "LEARNING", "LENDING", "LIGHTNING", "LISTING", "LIVING",
+    "LOADING", "LODGING", "LONGING", "MEANING", "MEETING", "MINING",
+    "MISSING", "MORNING", "NURSING", "OFFERING", "OPENING", "OPENING",
+    "OUTING", "PAINTING", "PARKING", "PENDING", "PLANNING", "PLUMBING",
+    "PRESSING", "PRICING", "PRINTING", "PUDDING", "RANKING", "RATING",
+    "READING", "RECORDING", "RING", "ROOFING", "RULING", "RUNNING",
+    "SAVING", "SAYING", "SETTING", "SHIPPING", "SHOOTING", "SHOPPING",
+    "SING", "SITTING", "SKATING", "SKIING", "SMOKING", "SOMETHING",
+    "SPELLING", "SPENDING", "SPORTING", "SPRING", "STAFFING",
+    "STANDING", "STERLING", "STING", "STOCKING", "STRING", "STUNNING",
+    "SUFFERING", "SURFING", "SURROUNDING", "SWING", "TEACHING",
+    "THING", "TIMING", "TRADING", "TRAINING", "TRAVELING", "TUNING",
+    "TURNING", "UNDERLYING", "WARNING", "WASHING", "WEDDING",
+    "WILLING", "WINDING", "WING", "WINNING", "WIRING", "WORKING",
+    "WRESTLING", "WRITING",
+    # -ED words that are standalone adjectives/nouns
+    "ADVANCED", "AGED", "ALLEGED", "ALLIED", "ANIMATED", "ARMED",
+    "ASSUMED", "ASSURED", "ATTACHED", "BELOVED", "BIASED", "BLESSED",
+    "BREED", "BURIED", "CLOSED", "COLORED", "COMBINED", "COMPLICATED",
+    "CONCERNED", "CONFUSED", "CONNECTED", "CONVINCED", "CROOKED",
+    "CROWDED", "CURVED", "DATED", "DEDICATED", "DETAILED", "DETERMINED",
+    "DISABLED", "DISAPPOINTED", "EDUCATED", "ELEVATED", "EMBEDDED",
+    "EMPLOYED", "ENCLOSED", "ENRICHED", "ENTITLED", "EVOLVED",
+    "EXCITED", "EXPERIENCED", "EXPOSED", "EXTENDED", "FIXED", "HUNDRED",
+    "INDEED", "INFORMED", "INSPIRED", "INTERESTED", "ISOLATED",
+    "LIMITED", "LINKED", "LOCATED", "LOVED", "NAKED", "ORGANIZED",
+    "PLEASED", "POINTED", "PRONOUNCED", "PROPOSED", "QUALIFIED",
+    "REDUCED", "REFINED", "RELATED", "RELAXED", "RETIRED", "SACRED",
+    "SATISFIED", "SCARED", "SCATTERED", "SEED", "SELECTED", "SHED",
+    "SKILLED", "SLED", "SPEED", "SPIRITED", "SUPPOSED", "SURPRISED",
+    "TALENTED", "TIRED", "TROUBLED", "TWISTED", "UNITED",
+    "UNUSED", "VARIED", "WEED", "WICKED", "WORRIED", "WOUNDED",
+    # -ER words that are standalone nouns
+    "BANNER", "BLENDER", "BOULDER", "BUFFER", "BUTTER", "CHAPTER",
+    "CHARACTER", "CLUSTER", "COMPUTER", "CONSIDER", "CONSUMER",
+    "CONTAINER", "COUNTER", "COVER", "CRACKER", "CYLINDER",
+    "DISCOVER", "DISORDER", "ENCOUNTER", "ENTER", "FEVER", "FINGER",
+    "FLOWER", "FOLDER", "GENDER", "GINGER", "HAMMER", "HUNGER",
+    "LADDER", "LASER", "LAUGHTER", "LAYER", "LEATHER", "LETTER",
+    "LEVER", "LITTER", "LIVER", "LUMBER", "MANNER", "MASTER",
+    "MATTER", "MEMBER", "MERGER", "METER", "MONSTER", "MURDER",
+    "NUMBER", "OFFER", "ORDER", "OTHER", "OVER", "OYSTER", "PAPER",
+    "PEPPER", "PLASTER", "PLUNDER", "POWDER", "POWER", "PREMIER",
+    "PRIMER", "PROPER", "QUARTER", "RATHER", "RECOVER", "RUBBER",
+    "SEMESTER", "SHELTER", "SHOULDER", "SILVER", "SMOTHER", "SOCCER",
+    "SOLDER", "SPIDER", "STAGGER", "SUMMER", "SUPER", "TIMBER",
+    "TIMBER", "TOGETHER", "TOWER", "TRANSFER", "TRIGGER", "UNDER",
+    "UPPER", "UTTER", "WANDER", "WATER", "WEATHER", "WHISPER",
+    "WINTER", "WONDER",
+    # -LY words that are standalone adjectives
+    "BELLY", "BULLY", "CURLY", "DAILY", "DEADLY", "EARLY", "ELDERLY",
+    "FAIRLY", "FAMILY", "FINALLY", "FLY", "FRIENDLY", "GHASTLY",
+    "GLOOMY", "GODLY", "GOODLY", "HARDLY", "HEAVENLY", "HOLLY",
+    "HOMELY", "JELLY", "JOLLY", "LILY", "LIKELY", "LIVELY", "LONELY",
+    "LOVELY", "MANLY", "MERELY", "MONTHLY", "NAMELY", "NEARLY",
+    "NEWLY", "NIGHTLY", "NOBLY", "ONLY", "ORDERLY", "PARTLY",
+    "POORLY", "RALLY", "RARELY", "SILLY", "SOLELY", "SUPPLY",
+    "SURELY", "TALLY", "UGLY", "UNLIKELY", "WEEKLY", "WHOLLY",
+    "WORLDLY",
+}
+
 
 def is_bad_clue(en_clue):
     """Reject clues that are garbled, circular, or too short to be useful."""
@@ -142,26 +232,238 @@ def is_bad_zh_clue(zh_clue):
     return False
 
 
-def main():
-    # Load word-level translations (pre-built EN→ZH mapping)
+def load_sources():
+    """Load the enriched words and the translation, override and level tables."""
+    # Word-level translations (pre-built EN→ZH mapping)
     word_translations = {}
     if TRANSLATIONS_PATH.exists():
         word_translations = json.loads(TRANSLATIONS_PATH.read_text(encoding="utf-8"))
         print(f"Loaded {len(word_translations)} word translations")
 
-    # Load manual translation overrides (fixes for bad auto-translations)
+    # Manual translation overrides (fixes for bad auto-translations)
     overrides = {}
     if OVERRIDES_PATH.exists():
         overrides = json.loads(OVERRIDES_PATH.read_text(encoding="utf-8"))
         print(f"Loaded {len(overrides)} translation overrides")
 
-    # Load word levels (from score_words.py output)
+    # Word levels (from score_words.py output)
     levels_data = {}
     if LEVELS_PATH.exists():
         levels_json = json.loads(LEVELS_PATH.read_text(encoding="utf-8"))
         levels_data = levels_json.get("words", {})
         print(f"Loaded {len(levels_data)} word levels")
 
+    enriched = json.loads(ENRICHED_PATH.read_text(encoding="utf-8")) or {}
+    return {
+        "enriched": enriched,
+        "translations": word_translations,
+        "overrides": overrides,
+        "levels": levels_data,
+    }
+
+
+def rules_hash():
+    """Hash of this script: any change to its filters invalidates every cached entry."""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def source_hash(raw_word, clue_obj, sources):
+    """Hash everything that build_entry() reads for one enriched word."""
+    key = raw_word.strip().upper()
+    inputs = [
+        raw_word,
+        clue_obj,
+        sources["translations"].get(key),
+        sources["overrides"].get(key),
+        sources["levels"].get(key),
+    ]
+    data = json.dumps(inputs, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def known_word(raw_word):
+    """Return raw_word as an uppercase known English word, or None."""
+    w = raw_word.strip().upper()
+    return w if re.fullmatch(r"[A-Z]+", w) else None
+
+
+def build_entry(raw_word, clue_obj, sources):
+    """Filter one enriched word and build its dictionary entry.
+
+    Returns (key, entry, reason): entry is None when the word is rejected,
+    with reason "filtered" (length, characters, hard exclusion, no clue) or
+    "bad clue".
+    """
+    w = raw_word.strip().lower()
+    key = w.upper()
+    if not (3 <= len(w) <= 10):
+        return key, None, "filtered"
+    if not re.fullmatch(r"[a-z]+", w):
+        return key, None, "filtered"
+    if w in HARD_EXCLUDED:
+        return key, None, "filtered"
+
+    # Check if this is a soft-excluded word
+    soft_info = SOFT_EXCLUDED.get(w)
+
+    en = (clue_obj or {}).get("en", "") if isinstance(clue_obj, dict) else ""
+    zh = (clue_obj or {}).get("zh", "") if isinstance(clue_obj, dict) else ""
+    # Prefer: override > word translation > definition translation
+    if key in sources["overrides"]:
+        zh = sources["overrides"][key]
+    elif key in sources["translations"]:
+        zh = sources["translations"][key]
+    if not en and not zh:
+        return key, None, "filtered"
+    if is_bad_clue(en):
+        return key, None, "bad clue"
+    # Reject full-sentence Chinese translations (should be a concise word)
+    if len(zh) > 15:
+        return key, None, "bad clue"
+    # Reject sentence-like Chinese clues (e.g. ending with "。")
+    if is_bad_zh_clue(zh):
+        return key, None, "bad clue"
+
+    entry = {
+        "length": len(w),
+        "clues": {
+            "easy": {"en": en, "zh": zh},
+            "medium": {"en": en, "zh": zh},
+            "hard": {"en": en, "zh": zh}
+        }
+    }
+
+    # Merge level data from word_levels.json
+    level_info = sources["levels"].get(key, {})
+    if level_info:
+        entry["level"] = level_info.get("level", 6)
+        entry["exams"] = level_info.get("exams", [])
+
+    # Tag soft-excluded words
+    if soft_info:
+        entry["tags"] = soft_info["tags"]
+        entry["excludeDefault"] = True
+
+    return key, entry, None
+
+
+def plural_base(key):
+    """Return the singular a plural-looking key would duplicate, or None."""
+    if key.endswith("S") and len(key) >= 4 and key not in INFLECTION_SAFELIST:
+        return key[:-1]
+    return None
+
+
+def inflection_bases(key):
+    """Return the base forms an inflected-looking key would duplicate."""
+    if key in INFLECTION_SAFELIST:
+        return []
+    # Check -ED, -ING, -ER, -LY, -EST suffixes
+    bases = []
+    if key.endswith("ED") and len(key) > 4:
+        bases.append(key[:-2])       # WALKED → WALK
+        bases.append(key[:-2] + "E") # NAMED → NAME
+        if len(key) > 5 and key[-3] == key[-4]:
+            bases.append(key[:-3])   # STOPPED → STOP
+    if key.endswith("ING") and len(key) > 5:
+        bases.append(key[:-3])       # WALKING → WALK
+        bases.append(key[:-3] + "E") # MAKING → MAKE
+    if key.endswith("ER") and len(key) > 4:
+        bases.append(key[:-2])       # BIGGER → BIG
+        bases.append(key[:-1])       # CLOSER → CLOSE
+    if key.endswith("EST") and len(key) > 5:
+        bases.append(key[:-3])       # LOWEST → LOW
+        bases.append(key[:-2])       # NICEST → NICE
+    if key.endswith("LY") and len(key) > 4:
+        bases.append(key[:-2])       # QUICKLY → QUICK
+    return [base for base in bases if base != key]
+
+
+def duplicate_of(key, known_words):
+    """Return ("plural" or "inflection", base) if key duplicates a known word, else None.
+
+    Every dictionary key is itself a known source word, so checking the
+    known words alone also covers bases that made it into the dictionary;
+    the INFLECTION_SAFELIST protects standalone words that only look
+    inflected (e.g. EVENING, BUILDING).
+    """
+    base = plural_base(key)
+    if base is not None and base in known_words:
+        return ["plural", base]
+    for base in inflection_bases(key):
+        if base in known_words:
+            return ["inflection", base]
+    return None
+
+
+def process_word(raw_word, clue_obj, sources, known_words, digest):
+    """Build the build-state record of one enriched word."""
+    key, entry, reason = build_entry(raw_word, clue_obj, sources)
+    record = {"hash": digest, "key": key, "entry": entry, "reason": reason,
+              "duplicate": None, "bases": []}
+    if entry is not None:
+        plural = plural_base(key)
+        record["bases"] = ([plural] if plural else []) + inflection_bases(key)
+        record["duplicate"] = duplicate_of(key, known_words)
+    return record
+
+
+def load_state(path=STATE_PATH):
+    """Return the saved build state, or None if it is missing or unreadable."""
+    try:
+        state = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def save_state(state, path=STATE_PATH):
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, separators=(",", ":")),
+                   encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def build_records(sources, previous=None):
+    """Return ({raw word: record}, work) for every enriched word.
+
+    With previous (the records of an earlier build under the same rules),
+    a word is processed again only if its inputs changed; a reused word
+    has its duplicate check redone only when a base form it depends on
+    appeared in or disappeared from the source words. work counts the
+    "processed" and "rechecked" words.
+    """
+    enriched = sources["enriched"]
+    known_words = {w for w in map(known_word, enriched) if w}
+    previous = previous or {}
+    dependents = set()
+    if previous:
+        old_known = {w for w in map(known_word, previous) if w}
+        changed_known = known_words ^ old_known
+        for raw_word, record in previous.items():
+            if any(base in changed_known for base in record["bases"]):
+                dependents.add(raw_word)
+
+    records = {}
+    work = {"processed": 0, "rechecked": 0}
+    for raw_word, clue_obj in enriched.items():
+        digest = source_hash(raw_word, clue_obj, sources)
+        record = previous.get(raw_word)
+        if record is None or record["hash"] != digest:
+            record = process_word(raw_word, clue_obj, sources, known_words, digest)
+            work["processed"] += 1
+        elif raw_word in dependents:
+            record = dict(record, duplicate=duplicate_of(record["key"], known_words))
+            work["rechecked"] += 1
+        records[raw_word] = record
+    return records, work
+
+
+def assemble(records, levels_data):
+    """Build the dictionary structure from build records, printing the usual counts."""
     dictionary = {
         "metadata": {
             "word_count": 0,
@@ -172,198 +474,36 @@ def main():
 
     bad_clue_count = 0
     soft_excluded_count = 0
-
-    enriched = json.loads(ENRICHED_PATH.read_text(encoding="utf-8"))
-    for raw_word, clue_obj in (enriched or {}).items():
-        w = raw_word.strip().lower()
-        if not (3 <= len(w) <= 10):
-            continue
-        if not re.fullmatch(r"[a-z]+", w):
-            continue
-        if w in HARD_EXCLUDED:
-            continue
-
-        # Check if this is a soft-excluded word
-        soft_info = SOFT_EXCLUDED.get(w)
-
-        en = (clue_obj or {}).get("en", "") if isinstance(clue_obj, dict) else ""
-        zh = (clue_obj or {}).get("zh", "") if isinstance(clue_obj, dict) else ""
-        key = w.upper()
-        # Prefer: override > word translation > definition translation
-        if key in overrides:
-            zh = overrides[key]
-        elif key in word_translations:
-            zh = word_translations[key]
-        if not en and not zh:
+    duplicates = {}
+    for record in records.values():
+        entry = record["entry"]
+        if entry is None:
+            if record["reason"] == "bad clue":
+                bad_clue_count += 1
             continue
-        if is_bad_clue(en):
-            bad_clue_count += 1
-            continue
-        # Reject full-sentence Chinese translations (should be a concise word)
-        if len(zh) > 15:
-            bad_clue_count += 1
-            continue
-        # Reject sentence-like Chinese clues (e.g. ending with "。")
-        if is_bad_zh_clue(zh):
-            bad_clue_count += 1
-            continue
-
-        entry = {
-            "length": len(w),
-            "clues": {
-                "easy": {"en": en, "zh": zh},
-                "medium": {"en": en, "zh": zh},
-                "hard": {"en": en, "zh": zh}
-            }
-        }
-
-        # Merge level data from word_levels.json
-        level_info = levels_data.get(key, {})
-        if level_info:
-            entry["level"] = level_info.get("level", 6)
-            entry["exams"] = level_info.get("exams", [])
-
-        # Tag soft-excluded words
-        if soft_info:
-            entry["tags"] = soft_info["tags"]
-            entry["excludeDefault"] = True
+        if entry.get("excludeDefault"):
             soft_excluded_count += 1
-
-        dictionary["words"][key] = entry
+        dictionary["words"][record["key"]] = entry
+        if record["duplicate"]:
+            duplicates[record["key"]] = record["duplicate"][0]
+        else:
+            duplicates.pop(record["key"], None)
 
     if bad_clue_count:
         print(f"Rejected {bad_clue_count} words with bad clues")
     if soft_excluded_count:
         print(f"Tagged {soft_excluded_count} soft-excluded words")
 
-    # Build a set of all known English words from source data (including words
-    # that were filtered out due to length, exclusion, or bad clues). This lets
-    # us detect plurals even when the base form isn't in the final dictionary.
-    all_known_words = set()
-    for raw_word in (enriched or {}):
-        w = raw_word.strip().upper()
-        if re.fullmatch(r"[A-Z]+", w):
-            all_known_words.add(w)
-
-    # Standalone words that happen to look like inflections — never remove these.
-    INFLECTION_SAFELIST = {
-        # -ING words that are standalone nouns/adjectives
-        "AMAZING", "BINDING", "BLESSING", "BORING", "BUILDING", "CEILING",
-        "CLOTHING", "COATING", "COMING", "CUNNING", "CUTTING", "DARLING",
-        "DRAWING", "DWELLING", "EARNING", "EVENING", "EXCITING", "FEELING",
-        "FILLING", "FINDING", "FITTING", "BLESSING", "GAMBLING", "GREETING",
-        "GROUNDING", "HEADING", "HEARING", "HIDING", "HIKING", "HOLDING",
-        "HOUSING", "HUNTING", "KILLING", "KNITTING", "LANDING", "LASTING",
-        "LEADING", "LEARNING", "LENDING", "LIGHTNING", "LISTING", "LIVING",
-        "LOADING", "LODGING", "LONGING", "MEANING", "MEETING", "MINING",
-        "MISSING", "MORNING", "NURSING", "OFFERING", "OPENING", "OPENING",
-        "OUTING", "PAINTING", "PARKING", "PENDING", "PLANNING", "PLUMBING",
-        "PRESSING", "PRICING", "PRINTING", "PUDDING", "RANKING", "RATING",
-        "READING", "RECORDING", "RING", "ROOFING", "RULING", "RUNNING",
-        "SAVING", "SAYING", "SETTING", "SHIPPING", "SHOOTING", "SHOPPING",
-        "SING", "SITTING", "SKATING", "SKIING", "SMOKING", "SOMETHING",
-        "SPELLING", "SPENDING", "SPORTING", "SPRING", "STAFFING",
-        "STANDING", "STERLING", "STING", "STOCKING", "STRING", "STUNNING",
-        "SUFFERING", "SURFING", "SURROUNDING", "SWING", "TEACHING",
-        "THING", "TIMING", "TRADING", "TRAINING", "TRAVELING", "TUNING",
-        "TURNING", "UNDERLYING", "WARNING", "WASHING", "WEDDING",
-        "WILLING", "WINDING", "WING", "WINNING", "WIRING", "WORKING",
-        "WRESTLING", "WRITING",
-        # -ED words that are standalone adjectives/nouns
-        "ADVANCED", "AGED", "ALLEGED", "ALLIED", "ANIMATED", "ARMED",
-        "ASSUMED", "ASSURED", "ATTACHED", "BELOVED", "BIASED", "BLESSED",
-        "BREED", "BURIED", "CLOSED", "COLORED", "COMBINED", "COMPLICATED",
-        "CONCERNED", "CONFUSED", "CONNECTED", "CONVINCED", "CROOKED",
-        "CROWDED", "CURVED", "DATED", "DEDICATED", "DETAILED", "DETERMINED",
-        "DISABLED", "DISAPPOINTED", "EDUCATED", "ELEVATED", "EMBEDDED",
-        "EMPLOYED", "ENCLOSED", "ENRICHED", "ENTITLED", "EVOLVED",
-        "EXCITED", "EXPERIENCED", "EXPOSED", "EXTENDED", "FIXED", "HUNDRED",
-        "INDEED", "INFORMED", "INSPIRED", "INTERESTED", "ISOLATED",
-        "LIMITED", "LINKED", "LOCATED", "LOVED", "NAKED", "ORGANIZED",
-        "PLEASED", "POINTED", "PRONOUNCED", "PROPOSED", "QUALIFIED",
-        "REDUCED", "REFINED", "RELATED", "RELAXED", "RETIRED", "SACRED",
-        "SATISFIED", "SCARED", "SCATTERED", "SEED", "SELECTED", "SHED",
-        "SKILLED", "SLED", "SPEED", "SPIRITED", "SUPPOSED", "SURPRISED",
-        "TALENTED", "TIRED", "TROUBLED", "TWISTED", "UNITED",
-        "UNUSED", "VARIED", "WEED", "WICKED", "WORRIED", "WOUNDED",
-        # -ER words that are standalone nouns
-        "BANNER", "BLENDER", "BOULDER", "BUFFER", "BUTTER", "CHAPTER",
-        "CHARACTER", "CLUSTER", "COMPUTER", "CONSIDER", "CONSUMER",
-        "CONTAINER", "COUNTER", "COVER", "CRACKER", "CYLINDER",
-        "DISCOVER", "DISORDER", "ENCOUNTER", "ENTER", "FEVER", "FINGER",
-        "FLOWER", "FOLDER", "GENDER", "GINGER", "HAMMER", "HUNGER",
-        "LADDER", "LASER", "LAUGHTER", "LAYER", "LEATHER", "LETTER",
-        "LEVER", "LITTER", "LIVER", "LUMBER", "MANNER", "MASTER",
-        "MATTER", "MEMBER", "MERGER", "METER", "MONSTER", "MURDER",
-        "NUMBER", "OFFER", "ORDER", "OTHER", "OVER", "OYSTER", "PAPER",
-        "PEPPER", "PLASTER", "PLUNDER", "POWDER", "POWER", "PREMIER",
-        "PRIMER", "PROPER", "QUARTER", "RATHER", "RECOVER", "RUBBER",
-        "SEMESTER", "SHELTER", "SHOULDER", "SILVER", "SMOTHER", "SOCCER",
-        "SOLDER", "SPIDER", "STAGGER", "SUMMER", "SUPER", "TIMBER",
-        "TIMBER", "TOGETHER", "TOWER", "TRANSFER", "TRIGGER", "UNDER",
-        "UPPER", "UTTER", "WANDER", "WATER", "WEATHER", "WHISPER",
-        "WINTER", "WONDER",
-        # -LY words that are standalone adjectives
-        "BELLY", "BULLY", "CURLY", "DAILY", "DEADLY", "EARLY", "ELDERLY",
-        "FAIRLY", "FAMILY", "FINALLY", "FLY", "FRIENDLY", "GHASTLY",
-        "GLOOMY", "GODLY", "GOODLY", "HARDLY", "HEAVENLY", "HOLLY",
-        "HOMELY", "JELLY", "JOLLY", "LILY", "LIKELY", "LIVELY", "LONELY",
-        "LOVELY", "MANLY", "MERELY", "MONTHLY", "NAMELY", "NEARLY",
-        "NEWLY", "NIGHTLY", "NOBLY", "ONLY", "ORDERLY", "PARTLY",
-        "POORLY", "RALLY", "RARELY", "SILLY", "SOLELY", "SUPPLY",
-        "SURELY", "TALLY", "UGLY", "UNLIKELY", "WEEKLY", "WHOLLY",
-        "WORLDLY",
-    }
-
-    # Deduplicate plurals: remove WORDS if WORD is a known English word
-    # (either in our dictionary or in the broader source data)
-    all_keys = set(dictionary["words"].keys())
-    plurals_removed = []
-    for key in list(all_keys):
-        if key.endswith("S") and len(key) >= 4 and key not in INFLECTION_SAFELIST:
-            base = key[:-1]
-            if base in all_keys or base in all_known_words:
-                del dictionary["words"][key]
-                all_keys.discard(key)
-                plurals_removed.append(key)
+    # Deduplicate plurals and inflected forms of known English words (in our
+    # dictionary or in the broader source data)
+    for key in duplicates:
+        del dictionary["words"][key]
+    plurals_removed = sum(1 for kind in duplicates.values() if kind == "plural")
+    inflected_removed = len(duplicates) - plurals_removed
     if plurals_removed:
-        print(f"Removed {len(plurals_removed)} plural duplicates")
-
-    # Deduplicate inflected forms: remove inflection if base exists in dictionary
-    # OR in the broader source data. The INFLECTION_SAFELIST protects standalone
-    # words that happen to look like inflections (e.g., EVENING, BUILDING).
-    inflected_removed = []
-    for key in sorted(list(all_keys)):
-        if key not in dictionary["words"]:
-            continue
-        if key in INFLECTION_SAFELIST:
-            continue
-        # Check -ED, -ING, -ER, -LY, -EST suffixes
-        bases = []
-        if key.endswith("ED") and len(key) > 4:
-            bases.append(key[:-2])       # WALKED → WALK
-            bases.append(key[:-2] + "E") # NAMED → NAME
-            if len(key) > 5 and key[-3] == key[-4]:
-                bases.append(key[:-3])   # STOPPED → STOP
-        if key.endswith("ING") and len(key) > 5:
-            bases.append(key[:-3])       # WALKING → WALK
-            bases.append(key[:-3] + "E") # MAKING → MAKE
-        if key.endswith("ER") and len(key) > 4:
-            bases.append(key[:-2])       # BIGGER → BIG
-            bases.append(key[:-1])       # CLOSER → CLOSE
-        if key.endswith("EST") and len(key) > 5:
-            bases.append(key[:-3])       # LOWEST → LOW
-            bases.append(key[:-2])       # NICEST → NICE
-        if key.endswith("LY") and len(key) > 4:
-            bases.append(key[:-2])       # QUICKLY → QUICK
-        for base in bases:
-            if base != key and (base in all_keys or base in all_known_words):
-                del dictionary["words"][key]
-                all_keys.discard(key)
-                inflected_removed.append(key)
-                break
+        print(f"Removed {plurals_removed} plural duplicates")
     if inflected_removed:
-        print(f"Removed {len(inflected_removed)} inflected duplicates")
+        print(f"Removed {inflected_removed} inflected duplicates")
 
     # Compute level distribution for metadata
     level_dist = {}
@@ -378,9 +518,97 @@ def main():
         dictionary["metadata"]["level_distribution"] = {
             str(k): v for k, v in sorted(level_dist.items())
         }
+    return dictionary
+
+
+def diff_dictionaries(old, new):
+    """Return the structured difference between two dictionary structures.
+
+    {"added": [words], "removed": [words], "changed": {word: [changed entry
+    fields]}, "metadata": [changed metadata keys]}, all sorted.
+    """
+    old_words = old.get("words", {})
+    new_words = new.get("words", {})
+    changed = {}
+    for key in sorted(old_words.keys() & new_words.keys()):
+        a, b = old_words[key], new_words[key]
+        if a != b:
+            changed[key] = sorted(f for f in a.keys() | b.keys() if a.get(f) != b.get(f))
+    old_meta, new_meta = old.get("metadata", {}), new.get("metadata", {})
+    return {
+        "added": sorted(new_words.keys() - old_words.keys()),
+        "removed": sorted(old_words.keys() - new_words.keys()),
+        "changed": changed,
+        "metadata": sorted(k for k in old_meta.keys() | new_meta.keys()
+                           if old_meta.get(k) != new_meta.get(k)),
+    }
+
+
+def print_diff(diff, limit=10):
+    print(f"Diff: {len(diff['added'])} added, {len(diff['removed'])} removed, "
+          f"{len(diff['changed'])} changed")
+    for label, words in (("added", diff["added"]), ("removed", diff["removed"]),
+                         ("changed", list(diff["changed"]))):
+        if words:
+            more = f" (+{len(words) - limit} more)" if len(words) > limit else ""
+            print(f"  {label}: {', '.join(words[:limit])}{more}")
+
+
+def load_previous_output(path=OUTPUT_PATH):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build word_dictionary.json (+ .bin)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reprocess only words whose inputs changed since the last build "
+                             f"(state in {STATE_PATH.name})")
+    parser.add_argument("--diff", type=str, default=None,
+                        help="Write the added/removed/changed words versus the previous "
+                             "dictionary to this JSON file")
+    args = parser.parse_args()
+
+    sources = load_sources()
+    rules = rules_hash()
+    previous = None
+    if args.incremental:
+        state = load_state()
+        if state is None or state.get("rules") != rules:
+            print("No build state for the current rules; doing a full build")
+        else:
+            previous = state["records"]
+    records, work = build_records(sources, previous)
+    if previous is not None:
+        print(f"Reprocessed {work['processed']} changed words, rechecked "
+              f"{work['rechecked']} dependent words, reused "
+              f"{len(records) - work['processed'] - work['rechecked']}")
+
+    dictionary = assemble(records, sources["levels"])
+    save_state({"version": STATE_VERSION, "rules": rules, "records": records})
+
+    old = load_previous_output()
+    diff = diff_dictionaries(old, dictionary)
+    print_diff(diff)
+    if args.diff:
+        Path(args.diff).write_text(json.dumps(diff, ensure_ascii=False, indent=2),
+                                   encoding="utf-8")
+        print(f"Wrote diff to {args.diff}")
+
+    binary = open_binary_dictionary(BINARY_PATH, OUTPUT_PATH)
+    if binary is not None:
+        binary.close()
+    same_order = list(old.get("words", {})) == list(dictionary["words"])
+    if old == dictionary and same_order and binary is not None:
+        print(f"{OUTPUT_PATH.name} is up to date ({dictionary['metadata']['word_count']} words)")
+        return
 
     OUTPUT_PATH.write_text(json.dumps(dictionary, ensure_ascii=False, indent=2), encoding="utf-8")
     print(f"Saved {dictionary['metadata']['word_count']} words to {OUTPUT_PATH}")
+    write_binary_dictionary(dictionary, BINARY_PATH, source_path=OUTPUT_PATH)
+    print(f"Saved binary dictionary to {BINARY_PATH} ({BINARY_PATH.stat().st_size} bytes)")
 
 
 if __name__ == "__main__":
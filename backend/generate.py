@@ -2,16 +2,31 @@
 """Generate crossword puzzles using the solver and puzzle builder."""
 
 import argparse
+import hashlib
 import json
+import random
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "backend" / "generator"))
 
-from solver import generate_one, build_tries, load_dictionary  # type: ignore
+from solver import generate_one, build_level_index, INDEX_BACKENDS  # type: ignore
+from numpy_index import HAVE_NUMPY  # type: ignore
+from puzzle_pack import write_packs  # type: ignore
+from generation_journal import (  # type: ignore
+    JOURNAL_DIR, GenerationJournal, job_key, templates_hash, view_hash,
+)
 from grid_templates import get_templates  # type: ignore
 from puzzle_builder import build_puzzle  # type: ignore
+from portfolio import race  # type: ignore
+from dictionary_provider import get_provider  # type: ignore
+from solver_stats import SolverStats  # type: ignore
+from template_scheduler import (  # type: ignore
+    STATS_PATH, TemplateScheduler, load_stats, merge_stats, save_stats,
+)
 
 
 DIFFICULTY_TIERS = [
@@ -43,50 +58,277 @@ EXAM_LABELS = {
 }
 
 
-def generate_tier(tier, tries, out_dir, manifest, puzzle_num, exam=None):
-    """Generate puzzles for a single difficulty tier. Returns updated puzzle_num."""
+_LEVEL_INDEX = {}
+
+
+def get_index(min_level=None, max_level=None, include_tags=None, backend="bitset"):
+    """Return a view of the shared level-aware word index for a level/tag filter.
+
+    The full index is built once per dictionary version and backend; each exam
+    range is a view over it rather than a separate index.
+    """
+    provider = get_provider()
+    provider.refresh()
+    key = (provider.version, backend)
+    index = _LEVEL_INDEX.get(key)
+    if index is None:
+        for old in [k for k in _LEVEL_INDEX if k[0] != provider.version]:
+            del _LEVEL_INDEX[old]
+        index = _LEVEL_INDEX[key] = build_level_index(backend)
+    return index.view(min_level, max_level, include_tags)
+
+
+def puzzle_seed(base_seed, exam, difficulty, n):
+    """Derive a stable per-puzzle seed, independent of worker count and order."""
+    digest = hashlib.sha256(f"{base_seed}:{exam}:{difficulty}:{n}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+_TEMPLATE_STATS = {}
+
+
+def get_template_stats(path):
+    """Return the template stats stored at path, read once per process."""
+    if path not in _TEMPLATE_STATS:
+        _TEMPLATE_STATS[path] = load_stats(path)
+    return _TEMPLATE_STATS[path]
+
+
+_VIEW_HASHES = {}
+
+
+def get_view_hash(levels):
+    """Return the generation_journal.view_hash of the word list for levels."""
+    min_level, max_level, include_tags = levels
+    provider = get_provider()
+    provider.refresh()
+    key = (provider.version, min_level, max_level,
+           frozenset(include_tags) if include_tags else None)
+    if key not in _VIEW_HASHES:
+        _VIEW_HASHES[key] = view_hash(get_index(*levels), provider)
+    return _VIEW_HASHES[key]
+
+
+def plan_tier(tier, puzzle_num, levels, exam=None, seed=0, portfolio=1, template_stats=None,
+              stats=False, index_backend="bitset", journal=None):
+    """Describe each puzzle of a tier as a job. Returns (jobs, updated puzzle_num).
+
+    With journal (a directory), each job also carries its journal key as
+    "inputs", so finished puzzles can be reused by later runs.
+    """
     size = tier["size"]
     difficulty = tier["difficulty"]
-    templates = get_templates(size)
-    if not templates:
+    if not get_templates(size):
         print(f"Warning: No templates for size {size}, skipping {difficulty} tier")
-        return puzzle_num
+        return [], puzzle_num
 
-    used_global = None
+    jobs = []
     for i in range(tier["count"]):
         puzzle_num += 1
-        grid = None
-        for _ in range(200):
-            grid = generate_one(templates, tries, size, used_global=used_global, max_attempts=10)
-            if grid:
-                break
-        if not grid:
-            raise SystemExit(f"Failed to generate {difficulty} puzzle {i+1} (size {size})")
-        puzzle_id = f"puzzle_{puzzle_num:03d}"
-        title = f"{tier['label']} #{i+1}"
-        puzzle = build_puzzle(grid, puzzle_id, title=title)
-        puzzle["difficulty"] = difficulty
-        puzzle["gridSize"] = size
-        if exam:
-            puzzle["exam"] = exam
-        out_path = out_dir / f"{puzzle_id}.json"
-        out_path.write_text(json.dumps(puzzle, ensure_ascii=False, indent=2), encoding="utf-8")
+        jobs.append({
+            "id": f"puzzle_{puzzle_num:03d}",
+            "title": f"{tier['label']} #{i+1}",
+            "n": i + 1,
+            "size": size,
+            "difficulty": difficulty,
+            "exam": exam,
+            "levels": levels,
+            "index_backend": index_backend,
+            "seed": puzzle_seed(seed, exam, difficulty, i + 1),
+            "portfolio": portfolio,
+            "template_stats": template_stats,
+            "stats": stats,
+            "journal": journal,
+        })
+    if journal:
+        view_digest = get_view_hash(levels)
+        templates_digest = templates_hash(get_templates(size))
+        for job in jobs:
+            job["inputs"] = job_key(job, view_digest, templates_digest)
+    return jobs, puzzle_num
+
+
+def stamp_puzzle(puzzle, job):
+    """Set the job-specific fields of puzzle (id, title, tier, exam) in place."""
+    puzzle["id"] = job["id"]
+    puzzle["title"] = job["title"]
+    puzzle["difficulty"] = job["difficulty"]
+    puzzle["gridSize"] = job["size"]
+    if job["exam"]:
+        puzzle["exam"] = job["exam"]
+    else:
+        puzzle.pop("exam", None)
+    return puzzle
+
+
+def generate_puzzle(job):
+    """Generate one job.
+
+    Returns {"puzzle": dict or None, "template_stats": delta, "stats": dict or
+    None}; "stats" holds the job's SolverStats.as_dict() when job["stats"].
+
+    Runs in worker processes under --jobs; the job's seed makes the result
+    independent of which process runs it. With a portfolio of more than one
+    instance the grid comes from whichever racing solver finishes first.
+    When the job names a template stats file, templates are picked by a
+    TemplateScheduler seeded from that file as it was at the start of the run.
+    A job with a journal stores its puzzle there as soon as it is built.
+    """
+    random.seed(job["seed"])
+    stats = SolverStats() if job.get("stats") else None
+    result = {"puzzle": None, "template_stats": {}, "stats": None}
+    with stats.stage("load index") if stats else nullcontext():
+        index = get_index(*job["levels"], backend=job.get("index_backend", "bitset"))
+    size = job["size"]
+    templates = get_templates(size)
+    scheduler = None
+    if job.get("template_stats"):
+        scheduler = TemplateScheduler(get_template_stats(job["template_stats"]))
+    if job.get("portfolio", 1) > 1:
+        with stats.stage("portfolio race") if stats else nullcontext():
+            grid = race(templates, index, size, job["portfolio"], max_attempts=2000,
+                        scheduler=scheduler, stats=stats)
+    else:
+        grid = generate_one(templates, index, size, max_attempts=2000, scheduler=scheduler,
+                            stats=stats)
+    if scheduler is not None:
+        result["template_stats"] = scheduler.delta
+    if grid:
+        puzzle = stamp_puzzle(build_puzzle(grid, job["id"], title=job["title"], stats=stats), job)
+        if job.get("inputs"):
+            GenerationJournal(job["journal"]).put(job["inputs"], puzzle)
+        result["puzzle"] = puzzle
+    if stats is not None:
+        result["stats"] = stats.as_dict()
+    return result
+
+
+def generate_jobs(jobs, out_dir, manifest, workers=1, stats=None, per_puzzle=None, pack=False,
+                  learn_templates=True):
+    """Generate jobs (in a process pool when workers > 1) and write them in order.
+
+    With learn_templates, template stats recorded by the jobs are merged
+    into their stats file at the end, also when a job fails; otherwise the
+    file is only read. Jobs planned with stats=True have their
+    SolverStats merged into stats and stored by puzzle id in per_puzzle
+    (when given). With pack, puzzles go into one pack file per exam (see
+    puzzle_pack) instead of one JSON file each, and puzzle_*.json files
+    left in out_dir by earlier unpacked runs are removed.
+
+    Jobs whose inputs are already in their journal reuse the stored puzzle
+    instead of being generated, and output files whose content did not
+    change are left untouched.
+    """
+    deltas = []
+    packed = [] if pack else None
+    reused = _journaled_puzzles(jobs)
+    pending = [job for job in jobs if job["id"] not in reused]
+    if reused:
+        print(f"  Reusing {len(reused)} of {len(jobs)} puzzles from the generation journal")
+    try:
+        if workers > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = _with_reused(jobs, reused, pool.map(generate_puzzle, pending))
+                _write_puzzles(jobs, results, out_dir, manifest, deltas, stats, per_puzzle,
+                               packed)
+        else:
+            results = _with_reused(jobs, reused, map(generate_puzzle, pending))
+            _write_puzzles(jobs, results, out_dir, manifest, deltas, stats, per_puzzle, packed)
+    finally:
+        if learn_templates:
+            _save_template_stats(jobs, deltas)
+    if packed:
+        for path, (size, written) in write_packs(packed, out_dir).items():
+            note = "" if written else " unchanged"
+            print(f"  Packed {path.name} ({size / 1024:.1f} KiB){note}")
+        stale = sorted(Path(out_dir).glob("puzzle_*.json"))
+        for path in stale:
+            path.unlink()
+        if stale:
+            print(f"  Removed {len(stale)} stale puzzle_*.json files")
+
+
+def _journaled_puzzles(jobs):
+    """Return {job id: stored puzzle} for the jobs found in their journal."""
+    reused = {}
+    for job in jobs:
+        if job.get("inputs"):
+            puzzle = GenerationJournal(job["journal"]).get(job["inputs"])
+            if puzzle is not None:
+                reused[job["id"]] = stamp_puzzle(puzzle, job)
+    return reused
+
+
+def _with_reused(jobs, reused, results):
+    """Yield a result per job, in job order: reused puzzles or the next generated result."""
+    results = iter(results)
+    for job in jobs:
+        if job["id"] in reused:
+            yield {"puzzle": reused[job["id"]], "template_stats": {}, "stats": None}
+        else:
+            yield next(results)
+
+
+def write_if_changed(path, text):
+    """Write text to path unless it already holds exactly that. Returns True if written."""
+    path = Path(path)
+    data = text.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def _save_template_stats(jobs, deltas):
+    path = next((job["template_stats"] for job in jobs if job.get("template_stats")), None)
+    if path is None or not any(deltas):
+        return
+    stats = load_stats(path)
+    for delta in deltas:
+        merge_stats(stats, delta)
+    save_stats(stats, path)
+
+
+def _write_puzzles(jobs, results, out_dir, manifest, deltas, stats, per_puzzle, packed=None):
+    for job, result in zip(jobs, results):
+        deltas.append(result["template_stats"])
+        if result["stats"] is not None:
+            if stats is not None:
+                stats.merge(result["stats"])
+            if per_puzzle is not None:
+                per_puzzle[job["id"]] = result["stats"]
+        puzzle = result["puzzle"]
+        size = job["size"]
+        difficulty = job["difficulty"]
+        if puzzle is None:
+            raise SystemExit(f"Failed to generate {difficulty} puzzle {job['n']} (size {size})")
+        puzzle_id = job["id"]
+        note = ""
+        if packed is None:
+            out_path = out_dir / f"{puzzle_id}.json"
+            if not write_if_changed(out_path, json.dumps(puzzle, ensure_ascii=False, indent=2)):
+                note = " unchanged"
         entry = {
             "id": puzzle_id,
-            "title": title,
+            "title": job["title"],
             "difficulty": difficulty,
             "gridSize": size,
             "file": f"puzzles/{puzzle_id}.json"
         }
-        if exam:
-            entry["exam"] = exam
+        if job["exam"]:
+            entry["exam"] = job["exam"]
         manifest.append(entry)
-        print(f"  [{difficulty}] {puzzle_id} ({size}x{size})")
+        if packed is not None:
+            packed.append((puzzle, entry))
+        print(f"  [{difficulty}] {puzzle_id} ({size}x{size}){note}")
 
-    return puzzle_num
 
-
-def generate_all_exams(out_dir, count_per_tier=None):
+def generate_all_exams(out_dir, count_per_tier=None, seed=0, workers=1, portfolio=1,
+                       template_stats=None, stats=None, per_puzzle=None, index_backend="bitset",
+                       pack=False, journal=None, learn_templates=True):
     """Generate puzzles for every exam level plus an 'all' set."""
     out_dir.mkdir(parents=True, exist_ok=True)
     manifest = []
@@ -96,19 +338,27 @@ def generate_all_exams(out_dir, count_per_tier=None):
     if count_per_tier is not None:
         tiers = [dict(t, count=count_per_tier) for t in tiers]
 
-    # Generate a set for each exam level
+    # Plan a set for each exam level, then generate them all in one pool
+    jobs = []
     for exam_key, (min_lv, max_lv) in EXAM_LEVEL_RANGES.items():
         label = EXAM_LABELS.get(exam_key, {}).get("zh", exam_key)
-        print(f"\n=== {label} ({exam_key}) level {min_lv}-{max_lv} ===")
-        words = load_dictionary(min_level=min_lv, max_level=max_lv)
-        print(f"  Dictionary: {len(words)} words")
-        tries = build_tries(words)
+        index = get_index(min_lv, max_lv, backend=index_backend)
+        print(f"=== {label} ({exam_key}) level {min_lv}-{max_lv}: {len(index)} words ===")
 
         for tier in tiers:
-            puzzle_num = generate_tier(tier, tries, out_dir, manifest, puzzle_num, exam=exam_key)
+            tier_jobs, puzzle_num = plan_tier(tier, puzzle_num, (min_lv, max_lv, None),
+                                              exam=exam_key, seed=seed, portfolio=portfolio,
+                                              template_stats=template_stats,
+                                              stats=stats is not None,
+                                              index_backend=index_backend, journal=journal)
+            jobs.extend(tier_jobs)
+
+    print(f"\nGenerating {len(jobs)} puzzles with {workers} worker(s), seed {seed}")
+    generate_jobs(jobs, out_dir, manifest, workers=workers, stats=stats, per_puzzle=per_puzzle,
+                  pack=pack, learn_templates=learn_templates)
 
     index_path = out_dir / "index.json"
-    index_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_if_changed(index_path, json.dumps(manifest, ensure_ascii=False, indent=2))
 
     # Write exam metadata for the frontend
     exam_meta = []
@@ -120,7 +370,7 @@ def generate_all_exams(out_dir, count_per_tier=None):
             "label_en": labels.get("en", exam_key),
         })
     meta_path = out_dir / "exams.json"
-    meta_path.write_text(json.dumps(exam_meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_if_changed(meta_path, json.dumps(exam_meta, ensure_ascii=False, indent=2))
 
     print(f"\nGenerated {puzzle_num} puzzles across {len(EXAM_LEVEL_RANGES)} exam levels to {out_dir}")
 
@@ -139,13 +389,63 @@ def main():
                         help="Generate puzzle sets for every exam level")
     parser.add_argument("--include-tags", type=str, nargs="*", default=None,
                         help="Include soft-excluded words with these tags")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes for puzzle generation (output does not depend on it)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Base seed for reproducible output (random if omitted); "
+                             "template stats are then read but not updated")
+    parser.add_argument("--portfolio", type=int, default=1,
+                        help="Race this many differently seeded solver processes per puzzle "
+                             "(output then depends on timing)")
+    parser.add_argument("--template-stats", type=str, default=str(STATS_PATH),
+                        help="File of per-template success counts used to pick templates "
+                             "(updated after each run without --seed)")
+    parser.add_argument("--no-template-stats", action="store_true",
+                        help="Pick templates uniformly and record no stats")
+    parser.add_argument("--index-backend", choices=INDEX_BACKENDS, default="bitset",
+                        help="Word index implementation (numpy builds large word lists "
+                             "faster; needs numpy installed)")
+    parser.add_argument("--journal", type=str, default=None,
+                        help="Directory of finished puzzles keyed by their inputs, used "
+                             "when --seed is given (default: generator/generation_journal); "
+                             "re-runs with the same --seed reuse unchanged puzzles and "
+                             "resume interrupted runs")
+    parser.add_argument("--no-journal", action="store_true",
+                        help="Generate every puzzle afresh and record nothing")
+    parser.add_argument("--pack", action="store_true",
+                        help="Write one compact pack file per exam instead of a JSON file "
+                             "per puzzle")
+    parser.add_argument("--stats", action="store_true",
+                        help="Print solver statistics (nodes, queries, rejections, stage times)")
+    parser.add_argument("--stats-json", type=str, default=None,
+                        help="Write the statistics, in total and per puzzle, to this JSON file")
     args = parser.parse_args()
+    if args.jobs > 1 and args.portfolio > 1:
+        parser.error("--jobs and --portfolio cannot be combined")
+    if args.index_backend == "numpy" and not HAVE_NUMPY:
+        parser.error("--index-backend numpy needs numpy (pip install numpy)")
+    if args.journal and args.seed is None:
+        parser.error("--journal needs --seed (journaled puzzles are only reused for the same seed)")
 
     out_dir = Path(args.output)
+    seed = args.seed if args.seed is not None else random.SystemRandom().randrange(2 ** 32)
+    template_stats = None if args.no_template_stats else str(Path(args.template_stats).resolve())
+    stats = SolverStats() if args.stats or args.stats_json else None
+    per_puzzle = {} if args.stats_json else None
+    # Seeded runs must not depend on earlier runs, so they leave template stats frozen
+    learn_templates = args.seed is None
+    # A random seed never matches a journal entry, so only seeded runs keep one
+    journal = None
+    if args.seed is not None and not args.no_journal:
+        journal = str(Path(args.journal or JOURNAL_DIR).resolve())
 
     # --all-exams mode: generate for every exam level
     if args.all_exams:
-        generate_all_exams(out_dir, count_per_tier=args.count)
+        generate_all_exams(out_dir, count_per_tier=args.count, seed=seed, workers=args.jobs,
+                           portfolio=args.portfolio, template_stats=template_stats,
+                           stats=stats, per_puzzle=per_puzzle, index_backend=args.index_backend,
+                           pack=args.pack, journal=journal, learn_templates=learn_templates)
+        report_stats(stats, per_puzzle, args)
         return
 
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -162,12 +462,11 @@ def main():
 
     include_tags = set(args.include_tags) if args.include_tags else None
 
-    words = load_dictionary(min_level=min_level, max_level=max_level,
-                            include_tags=include_tags)
-    tries = build_tries(words)
+    levels = (min_level, max_level, include_tags)
+    index = get_index(*levels, backend=args.index_backend)
 
     level_desc = f"level {min_level or 'any'}-{max_level or 'any'}"
-    print(f"Dictionary: {len(words)} words ({level_desc})")
+    print(f"Dictionary: {len(index)} words ({level_desc})")
 
     # Build the list of tiers to generate
     if args.size is not None:
@@ -182,13 +481,36 @@ def main():
     manifest = []
     puzzle_num = 0
 
+    jobs = []
     for tier in tiers:
-        puzzle_num = generate_tier(tier, tries, out_dir, manifest, puzzle_num, exam=args.exam)
+        tier_jobs, puzzle_num = plan_tier(tier, puzzle_num, levels, exam=args.exam, seed=seed,
+                                          portfolio=args.portfolio,
+                                          template_stats=template_stats,
+                                          stats=stats is not None,
+                                          index_backend=args.index_backend, journal=journal)
+        jobs.extend(tier_jobs)
+    print(f"Generating {len(jobs)} puzzles with {args.jobs} worker(s), seed {seed}")
+    generate_jobs(jobs, out_dir, manifest, workers=args.jobs, stats=stats, per_puzzle=per_puzzle,
+                  pack=args.pack, learn_templates=learn_templates)
 
     index_path = out_dir / "index.json"
-    index_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_if_changed(index_path, json.dumps(manifest, ensure_ascii=False, indent=2))
 
     print(f"\nGenerated {puzzle_num} puzzles to {out_dir}")
+    report_stats(stats, per_puzzle, args)
+
+
+def report_stats(stats, per_puzzle, args):
+    """Print and/or write the statistics requested by --stats / --stats-json."""
+    if stats is None:
+        return
+    if args.stats:
+        print()
+        print(stats.summary())
+    if args.stats_json:
+        data = {"total": stats.as_dict(), "puzzles": per_puzzle}
+        Path(args.stats_json).write_text(json.dumps(data, indent=2), encoding="utf-8")
+        print(f"Wrote solver statistics to {args.stats_json}")
 
 
 if __name__ == "__main__":
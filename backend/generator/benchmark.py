@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""Benchmark the solver and generator with fixed seeds.
+
+Runs solve() on every template of grid_templates.TEMPLATES and generate_one()
+for every grid size, each against every exam level range of generate.py,
+and reports success rate, search nodes, backtracks, nodes/sec and
+p50/p95/p99 time-to-solution per case. Every run is seeded, so node and
+backtrack counts are exact for the same code and dictionary; each run's time
+is the minimum over --repeats repetitions. Results can be written as JSON
+and compared with a saved baseline:
+
+    python3 benchmark.py --output bench.json
+    python3 benchmark.py --baseline bench.json
+
+The comparison gates on success rate, nodes and backtracks. Even as a
+minimum of 3 repeats, p50/p95 of identical runs differ by up to about 50%,
+so times only fail the gate when --time-threshold is given.
+
+--synthetic N replaces the real dictionary with N random words (with random
+levels, so the exam ranges still apply) to see how the index and the solver
+scale with a larger word list. --index-backend numpy runs the same cases on
+the NumPy word-matrix index.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from generate import EXAM_LEVEL_RANGES  # noqa: E402
+from grid_templates import TEMPLATES  # noqa: E402
+from solver import (  # noqa: E402
+    INDEX_BACKENDS, build_level_index, compile_template, generate_one, index_from_entries,
+    solve, usable_templates,
+)
+from numpy_index import HAVE_NUMPY  # noqa: E402
+from solver_stats import SolverStats  # noqa: E402
+
+BENCH_VERSION = 1
+
+# Relative English letter frequencies (per mille) for synthetic words.
+LETTER_FREQ = {
+    "E": 127, "T": 91, "A": 82, "O": 75, "I": 70, "N": 67, "S": 63, "H": 61,
+    "R": 60, "D": 43, "L": 40, "C": 28, "U": 28, "M": 24, "W": 24, "F": 22,
+    "G": 20, "Y": 20, "P": 19, "B": 15, "V": 10, "K": 8, "J": 2, "X": 2,
+    "Q": 1, "Z": 1,
+}
+# Share of synthetic words per length (3-9 letters, as in the real dictionary).
+LENGTH_WEIGHTS = {3: 8, 4: 15, 5: 18, 6: 18, 7: 16, 8: 13, 9: 12}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of values, or None if there are none."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def synthetic_index(count, seed=0, backend="bitset"):
+    """Build a word index of count distinct random words with levels 1-10.
+
+    Short lengths saturate first (there are only 26**3 three-letter strings);
+    their share then goes to longer words.
+    """
+    rng = random.Random(seed)
+    letters = list(LETTER_FREQ)
+    letter_weights = list(LETTER_FREQ.values())
+    lengths = list(LENGTH_WEIGHTS)
+    length_weights = list(LENGTH_WEIGHTS.values())
+    entries = []
+    seen = set()
+    misses = 0
+    while len(seen) < count and misses < 50 * count:
+        length = rng.choices(lengths, length_weights)[0]
+        word = "".join(rng.choices(letters, letter_weights, k=length))
+        if word in seen:
+            misses += 1
+            continue
+        seen.add(word)
+        entries.append((word, rng.randint(1, 10), (), False))
+    return index_from_entries(entries, backend)
+
+
+def timed(call, repeats):
+    """Run call() repeats times; return (its last result, the fastest run in seconds)."""
+    best = None
+    for _ in range(max(1, repeats)):
+        t0 = time.perf_counter()
+        result = call()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def summarize(runs):
+    """Reduce [(solved, SolverStats, seconds)] to the reported metrics."""
+    solved_times = [t for ok, _, t in runs if ok]
+    nodes = sum(stats.counters["nodes"] for _, stats, _ in runs)
+    elapsed = sum(t for _, _, t in runs)
+    return {
+        "runs": len(runs),
+        "success_rate": len(solved_times) / len(runs) if runs else 0.0,
+        "nodes": nodes,
+        "backtracks": sum(stats.counters["backtracks"] for _, stats, _ in runs),
+        "nodes_per_sec": nodes / elapsed if elapsed else 0.0,
+        "seconds": elapsed,
+        "p50": percentile(solved_times, 50),
+        "p95": percentile(solved_times, 95),
+        "p99": percentile(solved_times, 99),
+    }
+
+
+def warm_up(index, compiled):
+    """Build the index's lazily cached tables for compiled outside the timings."""
+    solve(compiled.new_grid(), compiled.slots, index, max_nodes=0, graph=compiled.graph)
+
+
+def bench_solve(index, size, template_no, template, seeds, max_nodes, repeats):
+    compiled = compile_template(template, size)
+    if not compiled.valid:
+        return None
+    if any(s["length"] not in index for s in compiled.slots):
+        return None
+    warm_up(index, compiled)
+    runs = []
+    for seed in seeds:
+        def once():
+            random.seed(f"solve:{size}:{template_no}:{seed}")
+            stats = SolverStats()
+            ok = solve(compiled.new_grid(), compiled.slots, index, max_nodes=max_nodes,
+                       allow_reuse=size <= 5, graph=compiled.graph, backjump=True, stats=stats)
+            return ok, stats
+
+        (ok, stats), seconds = timed(once, repeats)
+        runs.append((ok, stats, seconds))
+    return summarize(runs)
+
+
+def bench_generate(index, size, seeds, max_attempts, repeats):
+    templates = TEMPLATES[size]
+    for compiled in usable_templates(templates, size, index):
+        warm_up(index, compiled)
+    runs = []
+    for seed in seeds:
+        def once():
+            random.seed(f"generate:{size}:{seed}")
+            stats = SolverStats()
+            grid = generate_one(templates, index, size, max_attempts=max_attempts, stats=stats)
+            return grid is not None, stats
+
+        (ok, stats), seconds = timed(once, repeats)
+        runs.append((ok, stats, seconds))
+    return summarize(runs)
+
+
+def run(args):
+    t0 = time.perf_counter()
+    if args.synthetic:
+        base = synthetic_index(args.synthetic, seed=args.synthetic, backend=args.index_backend)
+        dictionary = f"synthetic:{args.synthetic}"
+    else:
+        base = build_level_index(args.index_backend)
+        dictionary = "word_dictionary"
+    build_seconds = time.perf_counter() - t0
+    print(f"Index: {len(base)} words ({dictionary}, {args.index_backend}) "
+          f"built in {build_seconds:.2f}s")
+
+    seeds = range(args.seeds)
+    sizes = args.size or sorted(TEMPLATES)
+    exams = args.exam or list(EXAM_LEVEL_RANGES)
+    cases = {}
+    for exam in exams:
+        min_level, max_level = EXAM_LEVEL_RANGES[exam]
+        index = base.view(min_level, max_level)
+        for size in sizes:
+            if args.mode in ("solve", "both"):
+                for t, template in enumerate(TEMPLATES[size]):
+                    result = bench_solve(index, size, t, template, seeds, args.max_nodes,
+                                         args.repeats)
+                    if result is not None:
+                        cases[f"solve/{exam}/{size}x{size}/t{t}"] = result
+            if args.mode in ("generate", "both"):
+                cases[f"generate/{exam}/{size}x{size}"] = bench_generate(
+                    index, size, seeds, args.max_attempts, args.repeats)
+
+    return {
+        "version": BENCH_VERSION,
+        "dictionary": dictionary,
+        "words": len(base),
+        "index_backend": args.index_backend,
+        "index_build_seconds": build_seconds,
+        "seeds": args.seeds,
+        "repeats": args.repeats,
+        "max_nodes": args.max_nodes,
+        "max_attempts": args.max_attempts,
+        "python": platform.python_version(),
+        "cases": cases,
+    }
+
+
+def print_report(report):
+    header = (f"{'case':<34} {'ok':>5} {'nodes':>9} {'backtr':>8} {'nodes/s':>9} "
+              f"{'p50':>8} {'p95':>8} {'p99':>8}")
+    print(header)
+    print("-" * len(header))
+
+    def ms(value):
+        return f"{value * 1000:.1f}" if value is not None else "-"
+
+    for name, case in report["cases"].items():
+        print(f"{name:<34} {case['success_rate']:>5.0%} {case['nodes']:>9} "
+              f"{case['backtracks']:>8} {case['nodes_per_sec']:>9.0f} {ms(case['p50']):>8} {ms(case['p95']):>8} "
+              f"{ms(case['p99']):>8}")
+    print("(times in ms over solved runs, each the fastest of its repeats)")
+
+
+def compare(report, baseline, threshold, time_threshold=None, min_delta=0.005):
+    """Return regression messages for cases that got worse than baseline.
+
+    A case regresses when its success rate drops by more than threshold
+    (absolute) or its node or backtrack count grows by more than threshold
+    (relative); those counts are deterministic, so threshold can be tight.
+    p50/p95 times are only checked when time_threshold is given, and time
+    changes under min_delta seconds are ignored.
+    """
+    problems = []
+    for name, case in report["cases"].items():
+        old = baseline.get("cases", {}).get(name)
+        if old is None:
+            continue
+        if case["success_rate"] < old["success_rate"] - threshold:
+            problems.append(f"{name}: success rate {old['success_rate']:.0%} -> "
+                            f"{case['success_rate']:.0%}")
+        limits = {"nodes": threshold, "backtracks": threshold}
+        if time_threshold is not None:
+            limits.update(p50=time_threshold, p95=time_threshold)
+        for metric, limit in limits.items():
+            before, after = old.get(metric), case.get(metric)
+            if not before or after is None or after <= before * (1 + limit):
+                continue
+            if metric in ("p50", "p95") and after - before < min_delta:
+                continue
+            problems.append(f"{name}: {metric} {before:.4g} -> {after:.4g} "
+                            f"(+{after / before - 1:.0%})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the crossword solver and generator")
+    parser.add_argument("--mode", choices=("solve", "generate", "both"), default="both")
+    parser.add_argument("--size", type=int, nargs="*", choices=sorted(TEMPLATES),
+                        help="Grid sizes to run (default: all)")
+    parser.add_argument("--exam", nargs="*", choices=list(EXAM_LEVEL_RANGES),
+                        help="Exam level ranges to run (default: all)")
+    parser.add_argument("--seeds", type=int, default=10, help="Fixed seeds per case")
+    parser.add_argument("--repeats", type=int, default=3,
+                        help="Time each seeded run this many times and keep the fastest")
+    parser.add_argument("--max-nodes", type=int, default=20000,
+                        help="Node budget per solve() run")
+    parser.add_argument("--max-attempts", type=int, default=50,
+                        help="Attempts per generate_one() run")
+    parser.add_argument("--synthetic", type=int, default=None,
+                        help="Use N synthetic random words instead of the dictionary")
+    parser.add_argument("--index-backend", choices=INDEX_BACKENDS, default="bitset",
+                        help="Word index implementation (numpy needs numpy installed)")
+    parser.add_argument("--output", type=str, default=None, help="Write results JSON here")
+    parser.add_argument("--baseline", type=str, default=None,
+                        help="Compare against this results JSON; exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="Allowed growth in nodes/backtracks and drop in success "
+                             "rate versus the baseline (0.05 = 5%%)")
+    parser.add_argument("--time-threshold", type=float, default=None,
+                        help="Also fail on p50/p95 growth beyond this (off by default; "
+                             "timings are noisy, use 1.0 or more)")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="Ignore time regressions smaller than this many seconds")
+    args = parser.parse_args()
+    if args.index_backend == "numpy" and not HAVE_NUMPY:
+        parser.error("--index-backend numpy needs numpy (pip install numpy)")
+
+    report = run(args)
+    print_report(report)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Wrote {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if baseline.get("dictionary") != report["dictionary"]:
+            print(f"Warning: baseline used {baseline.get('dictionary')}, "
+                  f"this run used {report['dictionary']}")
+        problems = compare(report, baseline, args.threshold, args.time_threshold,
+                           args.min_delta)
+        if problems:
+            print(f"\n{len(problems)} regression(s):")
+            for problem in problems:
+                print(f"  {problem}")
+            raise SystemExit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
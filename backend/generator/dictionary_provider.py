@@ -0,0 +1,147 @@
+"""Process-wide cached access to the word dictionary.
+
+The solver (word lists) and the puzzle builder (clues) both read
+word_dictionary.json. DictionaryProvider loads it once, from the binary
+dictionary when that is up to date, and shares it. refresh() stats the JSON.
+A changed size or mtime triggers a content-hash comparison, and the
+dictionary is reloaded only if the content really differs. Callers refresh
+once per unit of work (a word list load, a puzzle build); lookups in between
+are plain dict hits.
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+DICT_PATH = ROOT / "backend" / "dictionary" / "word_dictionary.json"
+BINARY_DICT_PATH = ROOT / "backend" / "dictionary" / "word_dictionary.bin"
+sys.path.insert(0, str(ROOT / "backend" / "dictionary"))
+
+from binary_dictionary import open_binary_dictionary  # noqa: E402
+
+
+def _file_hash(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+class DictionaryProvider:
+    """Loaded-once dictionary with O(1) entry and clue lookup.
+
+    Attributes:
+        version: Incremented on every (re)load; caches derived from the
+            dictionary (e.g. word indexes) should be keyed on it.
+    """
+
+    def __init__(self, json_path=DICT_PATH, binary_path=BINARY_DICT_PATH):
+        self.json_path = Path(json_path)
+        self.binary_path = Path(binary_path)
+        self.version = 0
+        self._signature = None
+        self._hash = None
+        self._binary = None
+        self._entries = None  # WORD -> entry (JSON) or WORD -> row (binary)
+
+    def _stat(self):
+        try:
+            st = self.json_path.stat()
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def refresh(self):
+        """Reload if the JSON changed on disk. Returns True if it reloaded.
+
+        The size/mtime signature is trusted; the JSON is only hashed once it
+        changes, to skip reloading a file that was touched but not edited.
+        """
+        signature = self._stat()
+        if self._entries is not None and signature == self._signature:
+            return False
+        digest = None
+        if self._entries is not None and signature is not None:
+            digest = _file_hash(self.json_path)
+            if digest == self._hash:
+                self._signature = signature
+                return False
+        self._load(signature, digest)
+        return True
+
+    def _loaded(self):
+        if self._entries is None:
+            self.refresh()
+        return self._entries
+
+    def _load(self, signature, digest=None):
+        if self._binary is not None:
+            self._binary.close()
+            self._binary = None
+        binary = open_binary_dictionary(self.binary_path, self.json_path)
+        if binary is not None:
+            self._binary = binary
+            self._entries = {word: row for row, word in enumerate(binary)}
+        else:
+            if not self.json_path.exists():
+                raise FileNotFoundError(f"Dictionary not found: {self.json_path}")
+            data = json.loads(self.json_path.read_text(encoding="utf-8"))
+            self._entries = data.get("words", {})
+        self._signature = signature
+        self._hash = digest
+        self.version += 1
+
+    def __len__(self):
+        return len(self._loaded())
+
+    def __contains__(self, word):
+        return word in self._loaded()
+
+    def entries(self):
+        """Return a WORD -> entry mapping (the binary dictionary itself when used)."""
+        self._loaded()
+        return self._binary if self._binary is not None else self._entries
+
+    def entry(self, word):
+        """Return the JSON-shaped entry for word, or {} if it is unknown."""
+        found = self._loaded().get(word)
+        if found is None:
+            return {}
+        return self._binary.entry(found) if self._binary is not None else found
+
+    def clue(self, word, difficulty="easy"):
+        """Return {"en", "zh"} for word at difficulty, or None."""
+        found = self._loaded().get(word)
+        if found is None:
+            return None
+        if self._binary is not None:
+            return self._binary.clue(found, difficulty)
+        return found.get("clues", {}).get(difficulty) or None
+
+    def level(self, word):
+        found = self._loaded().get(word)
+        if found is None:
+            return None
+        if self._binary is not None:
+            return self._binary.level(found)
+        return found.get("level")
+
+    def rows(self):
+        """Return (word, level, exclude_default, tags) for every word, in word order."""
+        self._loaded()
+        if self._binary is not None:
+            return list(self._binary.scan())
+        return [
+            (word, entry.get("level"), entry.get("excludeDefault", False), entry.get("tags", []))
+            for word, entry in sorted(self._entries.items())
+        ]
+
+
+_provider = None
+
+
+def get_provider():
+    """Return the shared DictionaryProvider for the default dictionary paths."""
+    global _provider
+    if _provider is None:
+        _provider = DictionaryProvider()
+    return _provider
@@ -0,0 +1,75 @@
+"""Flat byte-array crossword grid.
+
+FlatGrid keeps all cells in one bytearray indexed ``r * cols + c`` and takes
+slots as array('H') vectors of those indices. solve() reads its starting
+patterns from one and writes the finished fill through it; the search
+itself narrows word domains and never touches cells.
+"""
+
+from array import array
+
+BLACK = ord("#")
+EMPTY = ord(".")
+
+
+class FlatGrid:
+    """A grid as one bytearray of ASCII cells.
+
+    Attributes:
+        rows, cols: Grid dimensions.
+        cells: Cell bytes: b"#" black, b"." empty, else an uppercase letter.
+    """
+
+    __slots__ = ("rows", "cols", "cells")
+
+    def __init__(self, grid):
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if self.rows else 0
+        self.cells = bytearray("".join("".join(row) for row in grid), "ascii")
+
+    def slot_cells(self, slot):
+        """Return the flat cell indices of an extract_slots() slot."""
+        cols = self.cols
+        return array("H", [r * cols + c for r, c in slot["positions"]])
+
+    def place(self, cells, word):
+        """Write word (ASCII bytes) into cells."""
+        grid = self.cells
+        for k, ch in zip(cells, word):
+            grid[k] = ch
+
+    def pattern(self, cells):
+        """Return the solver pattern for cells: letters, None for empty cells."""
+        grid = self.cells
+        return [None if grid[k] == EMPTY else chr(grid[k]) for k in cells]
+
+    def word(self, cells):
+        grid = self.cells
+        return bytes(grid[k] for k in cells).decode("ascii")
+
+    def is_valid(self):
+        """True if every white cell lies in an across or down run of 3 or more."""
+        rows, cols, grid = self.rows, self.cols, self.cells
+        long_run = bytearray(rows * cols)
+        for start, step, count, stride, lines in ((0, 1, cols, cols, rows),
+                                                  (0, cols, rows, 1, cols)):
+            for line in range(lines):
+                base = start + line * stride
+                run = []
+                for n in range(count + 1):
+                    k = base + n * step
+                    if n < count and grid[k] != BLACK:
+                        run.append(k)
+                        continue
+                    if len(run) >= 3:
+                        for cell in run:
+                            long_run[cell] = 1
+                    run = []
+        return all(long_run[k] for k in range(rows * cols) if grid[k] != BLACK)
+
+    def write_to(self, grid):
+        """Copy the cells back into a list-of-lists grid, in place."""
+        cols, cells = self.cols, self.cells
+        for r, row in enumerate(grid):
+            row[:] = cells[r * cols:(r + 1) * cols].decode("ascii")
+        return grid
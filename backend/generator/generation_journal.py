@@ -0,0 +1,85 @@
+"""Content-addressed journal of generated puzzles for resumable, incremental runs.
+
+Each puzzle job is keyed by a hash of what decides whether its puzzle is
+still good: the words of its dictionary view with the levels and clues a
+puzzle shows for them, the templates of its grid size, its seed and its
+tier. A finished puzzle is stored under that key as soon as it is built, so
+a run that dies part-way resumes where it stopped, and a re-run after a
+dictionary edit only regenerates puzzles whose view actually changed.
+
+A reused puzzle is valid for its inputs but need not be what a fresh run
+would build: template stats and portfolio races also steer generation and
+are deliberately left out of the key. Puzzle id and title are not part of
+the key either; callers restamp them.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+JOURNAL_DIR = ROOT / "backend" / "generator" / "generation_journal"
+JOURNAL_VERSION = 1
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def view_hash(index, provider):
+    """Hash the words of an index view with the level and clue puzzles use for each."""
+    digest = hashlib.sha256()
+    for length in sorted(index.full):
+        for word in index.words_for(length, index.full[length]):
+            line = _dumps([word, provider.level(word), provider.clue(word)]) + "\n"
+            digest.update(line.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def templates_hash(templates):
+    return hashlib.sha256(_dumps(templates).encode("utf-8")).hexdigest()
+
+
+def job_key(job, view_digest, templates_digest):
+    """Return the journal key of a generate.py job."""
+    inputs = {
+        "version": JOURNAL_VERSION,
+        "view": view_digest,
+        "templates": templates_digest,
+        "seed": job["seed"],
+        "size": job["size"],
+        "difficulty": job["difficulty"],
+    }
+    return hashlib.sha256(_dumps(inputs).encode("utf-8")).hexdigest()
+
+
+class GenerationJournal:
+    """Directory of finished puzzles, one compact JSON file per job key.
+
+    Entries are written atomically and never modified, so concurrent
+    workers can add to the same journal. Deleting the directory only costs
+    regeneration.
+    """
+
+    def __init__(self, root=JOURNAL_DIR):
+        self.root = Path(root)
+
+    def path(self, key):
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Return the puzzle stored under key, or None."""
+        try:
+            return json.loads(self.path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, puzzle):
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        # Keep key order: restored puzzles must serialise exactly like fresh ones.
+        tmp.write_text(json.dumps(puzzle, ensure_ascii=False, separators=(",", ":")),
+                       encoding="utf-8")
+        os.replace(tmp, path)
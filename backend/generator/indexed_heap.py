@@ -0,0 +1,116 @@
+"""Indexed binary min-heap over small integer keys.
+
+Used by the solver to keep unassigned slots ordered by domain size, so MRV
+selection is a peek and a domain change is a single sift instead of a rescan
+of every slot.
+"""
+
+
+class IndexedHeap:
+    """Min-heap of keys 0..capacity-1 with updatable priorities.
+
+    Ties are broken by key so the order is deterministic. Internally each key
+    is ranked by the single int ``priority * capacity + key``, which keeps the
+    sift loops down to plain integer comparisons.
+    """
+
+    __slots__ = ("capacity", "heap", "pos", "prio", "rank")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.heap = []
+        self.pos = [-1] * capacity
+        self.prio = [0] * capacity
+        self.rank = list(range(capacity))
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, key):
+        return self.pos[key] >= 0
+
+    def _sift_up(self, i):
+        heap, pos, rank = self.heap, self.pos, self.rank
+        key = heap[i]
+        r = rank[key]
+        while i > 0:
+            parent = (i - 1) >> 1
+            pkey = heap[parent]
+            if rank[pkey] <= r:
+                break
+            heap[i] = pkey
+            pos[pkey] = i
+            i = parent
+        heap[i] = key
+        pos[key] = i
+
+    def _sift_down(self, i):
+        heap, pos, rank = self.heap, self.pos, self.rank
+        size = len(heap)
+        key = heap[i]
+        r = rank[key]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            ckey = heap[child]
+            right = child + 1
+            if right < size and rank[heap[right]] < rank[ckey]:
+                child = right
+                ckey = heap[right]
+            if rank[ckey] >= r:
+                break
+            heap[i] = ckey
+            pos[ckey] = i
+            i = child
+        heap[i] = key
+        pos[key] = i
+
+    def push(self, key, priority):
+        if self.pos[key] >= 0:
+            self.update(key, priority)
+            return
+        self.prio[key] = priority
+        self.rank[key] = priority * self.capacity + key
+        self.heap.append(key)
+        self._sift_up(len(self.heap) - 1)
+
+    def peek(self):
+        """Return (key, priority) of the minimum, or None if empty."""
+        if not self.heap:
+            return None
+        key = self.heap[0]
+        return key, self.prio[key]
+
+    def remove(self, key):
+        i = self.pos[key]
+        if i < 0:
+            return
+        heap = self.heap
+        last = heap.pop()
+        self.pos[key] = -1
+        if last != key:
+            heap[i] = last
+            self.pos[last] = i
+            self._sift_down(i)
+            self._sift_up(self.pos[last])
+
+    def pop(self):
+        key, priority = self.peek()
+        self.remove(key)
+        return key, priority
+
+    def update(self, key, priority):
+        """Change the priority of a queued key; unqueued keys only record it."""
+        old = self.prio[key]
+        if priority == old:
+            return
+        self.prio[key] = priority
+        self.rank[key] = priority * self.capacity + key
+        i = self.pos[key]
+        if i < 0:
+            return
+        if priority < old:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
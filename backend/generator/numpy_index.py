@@ -0,0 +1,130 @@
+"""Optional NumPy backend for building and querying the word index.
+
+WordIndex builds its masks one word at a time, OR-ing single bits into ever
+larger Python ints, which dominates start-up for big word lists.
+NumpyWordIndex keeps each length class as a uint8 matrix (words x positions)
+and derives every position, level and tag mask from a vectorised column
+comparison packed straight into an int. Pattern queries compare only the
+fixed columns of the matrix.
+
+The result is still a WordIndex: domains stay Python-int bitmasks, so the
+solver, views and caches work unchanged. Narrowing a crossing domain after
+a placement is already a single int AND in C; routing it through NumPy
+arrays would only add conversions.
+
+NumPy is an optional dependency; HAVE_NUMPY tells whether it is available.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from word_index import IndexView, WordIndex
+
+HAVE_NUMPY = np is not None
+
+
+def _to_int(flags):
+    """Pack a bool vector into a Python int whose bit i is flags[i]."""
+    return int.from_bytes(np.packbits(flags, bitorder="little").tobytes(), "little")
+
+
+class NumpyWordIndex(WordIndex):
+    """WordIndex built and pattern-matched with NumPy word matrices.
+
+    Attributes:
+        matrices: length -> uint8 array of shape (words, length).
+    """
+
+    def __init__(self, entries=()):
+        if np is None:
+            raise ImportError("NumpyWordIndex requires numpy (pip install numpy)")
+        self.matrices = {}
+        self._meta = {}  # length -> [(level, tags, exclude_default), ...] by word id
+        super().__init__()
+        self.extend(entries)
+
+    def add(self, word, level=None, tags=(), exclude_default=False):
+        """Add one word. Rebuilds its length class; prefer extend() for bulk loads."""
+        self.extend([(word, level, tags, exclude_default)])
+
+    def extend(self, entries):
+        """Add (word, level, tags, exclude_default) entries in bulk.
+
+        Word ids follow first appearance, as with repeated WordIndex.add().
+        """
+        touched = set()
+        for word, level, tags, exclude_default in entries:
+            if word in self.ids:
+                continue
+            length = len(word)
+            bucket = self.words.setdefault(length, [])
+            self.ids[word] = len(bucket)
+            bucket.append(word)
+            self._meta.setdefault(length, []).append((level, tuple(tags), exclude_default))
+            touched.add(length)
+        for length in touched:
+            self._rebuild(length)
+        if touched:
+            self._counts.clear()
+            self._buckets.clear()
+            self._views.clear()
+            self._matches.clear()
+
+    def _rebuild(self, length):
+        words = self.words[length]
+        meta = self._meta[length]
+        count = len(words)
+        matrix = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8)
+        matrix = matrix.reshape(count, length)
+        self.matrices[length] = matrix
+        self.full[length] = (1 << count) - 1
+        self.positions[length] = [
+            {chr(code): _to_int(column == code) for code in np.unique(column).tolist()}
+            for column in matrix.T
+        ]
+
+        levels = np.array([-1 if level is None else level for level, _, _ in meta])
+        self.levels[length] = {
+            (None if value == -1 else value): _to_int(levels == value)
+            for value in np.unique(levels).tolist()
+        }
+        tag_names = sorted({tag for _, tags, _ in meta for tag in tags})
+        self.tags[length] = {
+            tag: _to_int(np.fromiter((tag in tags for _, tags, _ in meta), bool, count))
+            for tag in tag_names
+        }
+        hidden = _to_int(np.fromiter((excluded for _, _, excluded in meta), bool, count))
+        if hidden:
+            self.hidden[length] = hidden
+        else:
+            self.hidden.pop(length, None)
+
+    def _make_view(self, allowed, key):
+        return NumpyIndexView(self, allowed, key)
+
+    def _match(self, pattern):
+        length = len(pattern)
+        full = self.full.get(length, 0)
+        if not full:
+            return 0
+        fixed = [(pos, ord(ch)) for pos, ch in enumerate(pattern) if ch is not None]
+        if not fixed:
+            return full
+        matrix = self.matrices[length]
+        pos, code = fixed[0]
+        flags = matrix[:, pos] == code
+        for pos, code in fixed[1:]:
+            flags &= matrix[:, pos] == code
+        return _to_int(flags) & full
+
+
+class NumpyIndexView(IndexView):
+    """IndexView of a NumpyWordIndex; matches patterns against the shared matrices."""
+
+    def __init__(self, parent, allowed, key=None):
+        super().__init__(parent, allowed, key)
+        self.matrices = parent.matrices
+
+    _match = NumpyWordIndex._match
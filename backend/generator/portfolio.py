@@ -0,0 +1,85 @@
+"""Race several randomized generate_one() instances across processes.
+
+Solve times on 9x9 grids are heavy-tailed: most attempts finish quickly and
+a few wander for a long time. Running differently seeded instances with
+different heuristics side by side and keeping the first grid cuts that tail.
+"""
+
+import multiprocessing
+import queue as queue_mod
+import random
+
+from solver import extract_slots, generate_one, slot_word
+from solver_stats import SolverStats
+from template_scheduler import merge_stats
+
+# Heuristic mix cycled over the racing instances.
+PORTFOLIO = [
+    {"restarts": "luby", "backjump": True},
+    {"restarts": "geometric", "backjump": True},
+    {"restarts": "luby", "backjump": False},
+    {"restarts": "geometric", "backjump": False},
+]
+
+
+def _run_instance(results, slot, seed, templates, index, size, used_global, max_attempts, config,
+                  scheduler, with_stats):
+    random.seed(seed)
+    stats = SolverStats() if with_stats else None
+    grid = generate_one(templates, index, size, used_global=used_global,
+                        max_attempts=max_attempts, scheduler=scheduler, stats=stats, **config)
+    results.put((slot, grid, scheduler.delta if scheduler is not None else None,
+                 stats.as_dict() if stats is not None else None))
+
+
+def race(templates, index, size, instances, used_global=None, max_attempts=500, scheduler=None,
+         stats=None):
+    """Return the first grid found by `instances` racing processes, or None.
+
+    Instance seeds are drawn from the caller's `random` state; which instance
+    wins depends on timing. The losing processes are terminated as soon as a
+    grid arrives. If used_global is given, the winner's words are added to it.
+    With a TemplateScheduler, every instance picks templates with a copy of
+    it and the winner's recorded attempts are merged into its delta.
+    Likewise the winner's SolverStats are merged into stats; the losers'
+    work is not counted.
+    """
+    ctx = multiprocessing.get_context()
+    results = ctx.Queue()
+    procs = []
+    for k in range(instances):
+        config = PORTFOLIO[k % len(PORTFOLIO)]
+        args = (results, k, random.getrandbits(64), templates, index, size,
+                set(used_global) if used_global is not None else None, max_attempts, config,
+                scheduler, stats is not None)
+        proc = ctx.Process(target=_run_instance, args=args, daemon=True)
+        proc.start()
+        procs.append(proc)
+
+    grid = None
+    pending = instances
+    try:
+        while pending:
+            try:
+                _, result, delta, instance_stats = results.get(timeout=0.5)
+            except queue_mod.Empty:
+                if not any(p.is_alive() for p in procs) and results.empty():
+                    break
+                continue
+            pending -= 1
+            if result is not None:
+                grid = result
+                if scheduler is not None:
+                    merge_stats(scheduler.delta, delta)
+                if stats is not None:
+                    stats.merge(instance_stats)
+                break
+    finally:
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+            proc.join()
+
+    if grid is not None and used_global is not None:
+        used_global.update(slot_word(grid, s) for s in extract_slots(grid))
+    return grid
@@ -1,16 +1,15 @@
 """Build puzzle JSON from a solved crossword grid."""
 
-import json
 import random
-from pathlib import Path
 
-ROOT = Path(__file__).resolve().parents[2]
-DICT_PATH = ROOT / "backend" / "dictionary" / "word_dictionary.json"
+from dictionary_provider import get_provider
 
 
 def load_dictionary():
-    data = json.loads(DICT_PATH.read_text(encoding="utf-8"))
-    return data.get("words", {})
+    """Return the shared WORD -> entry mapping."""
+    provider = get_provider()
+    provider.refresh()
+    return provider.entries()
 
 
 def is_black(cell):
@@ -77,8 +76,23 @@ def extract_words(grid, min_len=3):
     return words
 
 
-def build_puzzle(grid, puzzle_id, title="Generated Puzzle"):
-    words_dict = load_dictionary()
+def build_puzzle(grid, puzzle_id, title="Generated Puzzle", provider=None, stats=None):
+    """Return the puzzle dict for a filled grid.
+
+    With stats (a SolverStats), the build is timed as the "build puzzle"
+    stage and counted in "puzzles".
+    """
+    if stats is None:
+        return _build_puzzle(grid, puzzle_id, title, provider)
+    with stats.stage("build puzzle"):
+        puzzle = _build_puzzle(grid, puzzle_id, title, provider)
+    stats.add("puzzles")
+    return puzzle
+
+
+def _build_puzzle(grid, puzzle_id, title, provider):
+    provider = provider or get_provider()
+    provider.refresh()
     rows = len(grid)
     cols = len(grid[0]) if rows else 0
 
@@ -87,8 +101,7 @@ def build_puzzle(grid, puzzle_id, title="Generated Puzzle"):
 
     for w in words:
         key = w["answer"].upper()
-        entry = words_dict.get(key, {})
-        clue_obj = entry.get("clues", {}).get("easy", {}) if entry else {}
+        clue_obj = provider.clue(key)
         if not clue_obj:
             raise ValueError(f"Missing clue for word: {w['answer']}")
         clue_entry = {
@@ -100,7 +113,7 @@ def build_puzzle(grid, puzzle_id, title="Generated Puzzle"):
                 "zh": clue_obj.get("zh", "") if isinstance(clue_obj, dict) else str(clue_obj),
             },
         }
-        level = entry.get("level")
+        level = provider.level(key)
         if level is not None:
             clue_entry["level"] = level
         clues[w["dir"]].append(clue_entry)
@@ -0,0 +1,157 @@
+"""Bundle generated puzzles into compact pack files for the mini program.
+
+One pack file holds every puzzle of an exam set as newline-separated UTF-8
+JSON records, without indentation:
+
+    ["clue text", "线索", ...]                 record 0: shared string table
+    {"id": ..., "solution": ["S###U", ...], ...}  one record per puzzle
+    ...
+
+A packed puzzle stores its solution as row strings ("#" for black cells),
+prefilled cells as flat indices r * cols + c, and each clue as
+[num, row, col, en, zh, level], where en and zh index the string table and
+level is null when unknown. index.json entries point into the pack with
+"pack", "offset" and "length" (bytes of the puzzle record) and "strings"
+(bytes of record 0). A client can therefore read the string table once and
+slice out one puzzle without parsing the others. decode_puzzle() gives back
+the dict build_puzzle() returned.
+
+Packs are written as .txt because mini program packages only accept
+whitelisted file types; the content is not a single JSON document.
+"""
+
+import json
+from pathlib import Path
+
+PACK_VERSION = 1
+BLACK = "#"
+# Keys encoded specially; any other puzzle key (difficulty, exam, ...) is kept as is.
+ENCODED = ("id", "title", "rows", "cols", "solution", "prefilled", "clues")
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def pack_name(exam):
+    return f"pack_{exam or 'all'}.txt"
+
+
+class StringTable:
+    """Deduplicating list of strings; add() returns a string's index."""
+
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def add(self, text):
+        idx = self.ids.get(text)
+        if idx is None:
+            idx = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return idx
+
+
+def encode_puzzle(puzzle, strings):
+    """Return the compact record of a build_puzzle() dict, adding its clues to strings."""
+    cols = puzzle["cols"]
+    record = {
+        "v": PACK_VERSION,
+        "id": puzzle["id"],
+        "title": puzzle["title"],
+        "rows": puzzle["rows"],
+        "cols": cols,
+        "solution": ["".join(BLACK if ch is None else ch for ch in row)
+                     for row in puzzle["solution"]],
+        "prefilled": {level: [r * cols + c for r, c in cells]
+                      for level, cells in puzzle["prefilled"].items()},
+        "clues": {direction: [[clue["num"], clue["row"], clue["col"],
+                               strings.add(clue["clue"]["en"]),
+                               strings.add(clue["clue"]["zh"]),
+                               clue.get("level")]
+                              for clue in clues]
+                  for direction, clues in puzzle["clues"].items()},
+    }
+    record.update((key, value) for key, value in puzzle.items() if key not in ENCODED)
+    return record
+
+
+def decode_puzzle(record, strings):
+    """Rebuild the build_puzzle() dict from a packed record and its string table."""
+    cols = record["cols"]
+    puzzle = {
+        "id": record["id"],
+        "title": record["title"],
+        "rows": record["rows"],
+        "cols": cols,
+        "solution": [[None if ch == BLACK else ch for ch in row] for row in record["solution"]],
+        "prefilled": {level: [[k // cols, k % cols] for k in cells]
+                      for level, cells in record["prefilled"].items()},
+        "clues": {},
+    }
+    for direction, clues in record["clues"].items():
+        decoded = []
+        for num, row, col, en, zh, level in clues:
+            clue = {"num": num, "row": row, "col": col,
+                    "clue": {"en": strings[en], "zh": strings[zh]}}
+            if level is not None:
+                clue["level"] = level
+            decoded.append(clue)
+        puzzle["clues"][direction] = decoded
+    puzzle.update((key, value) for key, value in record.items()
+                  if key != "v" and key not in ENCODED)
+    return puzzle
+
+
+def write_pack(path, puzzles, entries):
+    """Write puzzles to the pack file at path and point their index entries into it.
+
+    entries are the index.json dicts of the puzzles, in the same order; their
+    "file" key is replaced by "pack", "offset", "length" and "strings".
+    A pack that already holds exactly these bytes is left untouched.
+    Returns (size in bytes, whether the file was written).
+    """
+    path = Path(path)
+    strings = StringTable()
+    records = [_dumps(encode_puzzle(puzzle, strings)).encode("utf-8") for puzzle in puzzles]
+    header = _dumps(strings.strings).encode("utf-8")
+
+    chunks = [header, b"\n"]
+    offset = len(header) + 1
+    for record, entry in zip(records, entries):
+        entry.pop("file", None)
+        entry["pack"] = f"puzzles/{path.name}"
+        entry["offset"] = offset
+        entry["length"] = len(record)
+        entry["strings"] = len(header)
+        chunks += [record, b"\n"]
+        offset += len(record) + 1
+    data = b"".join(chunks)
+    try:
+        if path.read_bytes() == data:
+            return len(data), False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return len(data), True
+
+
+def write_packs(packed, out_dir):
+    """Write one pack per exam from [(puzzle, index entry)]; returns {path: (bytes, written)}."""
+    groups = {}
+    for puzzle, entry in packed:
+        groups.setdefault(entry.get("exam"), []).append((puzzle, entry))
+    written = {}
+    for exam, items in groups.items():
+        path = Path(out_dir) / pack_name(exam)
+        written[path] = write_pack(path, [p for p, _ in items], [e for _, e in items])
+    return written
+
+
+def read_packed_puzzle(path, entry):
+    """Read one puzzle out of a pack, parsing only its string table and record."""
+    with open(path, "rb") as f:
+        strings = json.loads(f.read(entry["strings"]).decode("utf-8"))
+        f.seek(entry["offset"])
+        record = json.loads(f.read(entry["length"]).decode("utf-8"))
+    return decode_puzzle(record, strings)
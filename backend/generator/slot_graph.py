@@ -0,0 +1,61 @@
+"""Compiled slot crossing graph for a crossword grid.
+
+extract_slots() describes each slot by its (row, col) positions. The solver
+also needs to know which slots cross which, and at which offsets, so that a
+placement only touches the slots it actually constrains. SlotGraph compiles
+that once per grid layout.
+"""
+
+from array import array
+
+
+class SlotGraph:
+    """Slots numbered 0..n-1 with lengths, flat cell indices and crossings.
+
+    Attributes:
+        cols: Grid width used for flat cell indices (r * cols + c).
+        lengths: Slot lengths, by slot id.
+        cells: Flat cell indices covered by each slot, in word order, as
+            array('H') vectors (see flat_grid.FlatGrid).
+        crossings: Tuple of (slot_a, offset_a, slot_b, offset_b) with a < b.
+        neighbors: Per slot, tuple of (offset, other_slot, other_offset).
+        same_length: Per slot, the other slot ids of the same length.
+    """
+
+    __slots__ = ("cols", "lengths", "cells", "crossings", "neighbors", "same_length")
+
+    def __init__(self, slots, cols):
+        self.cols = cols
+        self.lengths = tuple(s["length"] for s in slots)
+        self.cells = tuple(array("H", [r * cols + c for r, c in s["positions"]]) for s in slots)
+
+        cell_slots = {}
+        for slot_id, cells in enumerate(self.cells):
+            for off, cell in enumerate(cells):
+                cell_slots.setdefault(cell, []).append((slot_id, off))
+
+        crossings = []
+        neighbors = [[] for _ in slots]
+        for cell in sorted(cell_slots):
+            members = cell_slots[cell]
+            for x, (a, oa) in enumerate(members):
+                for b, ob in members[x + 1:]:
+                    crossings.append((a, oa, b, ob))
+                    neighbors[a].append((oa, b, ob))
+                    neighbors[b].append((ob, a, oa))
+        self.crossings = tuple(crossings)
+        self.neighbors = tuple(tuple(n) for n in neighbors)
+
+        n = len(slots)
+        self.same_length = tuple(
+            tuple(j for j in range(n) if j != i and self.lengths[j] == self.lengths[i])
+            for i in range(n)
+        )
+
+    def __len__(self):
+        return len(self.lengths)
+
+
+def compile_slot_graph(grid, slots):
+    cols = len(grid[0]) if grid else 0
+    return SlotGraph(slots, cols)
@@ -1,60 +1,19 @@
 #!/usr/bin/env python3
-"""Crossword backtracking solver with trie-based lookup."""
+"""Crossword backtracking solver with bitset-indexed word lookup."""
 
 import argparse
-import json
+import hashlib
 import random
-from pathlib import Path
+import weakref
+from collections import OrderedDict
 
+from dictionary_provider import get_provider
 from grid_templates import get_templates
-
-ROOT = Path(__file__).resolve().parents[2]
-DICT_PATH = ROOT / "backend" / "dictionary" / "word_dictionary.json"
-
-
-class TrieNode:
-    __slots__ = ("children", "is_word")
-
-    def __init__(self):
-        self.children = {}
-        self.is_word = False
-
-
-class Trie:
-    def __init__(self):
-        self.root = TrieNode()
-
-    def insert(self, word: str):
-        node = self.root
-        for ch in word:
-            node = node.children.setdefault(ch, TrieNode())
-        node.is_word = True
-
-    def search_pattern(self, pattern):
-        """Return all words matching pattern list of chars/None."""
-        results = []
-        length = len(pattern)
-
-        def dfs(node, idx, buf):
-            if idx == length:
-                if node.is_word:
-                    results.append("".join(buf))
-                return
-            ch = pattern[idx]
-            if ch is None:
-                for nxt, child in node.children.items():
-                    buf.append(nxt)
-                    dfs(child, idx + 1, buf)
-                    buf.pop()
-            else:
-                child = node.children.get(ch)
-                if child:
-                    buf.append(ch)
-                    dfs(child, idx + 1, buf)
-                    buf.pop()
-
-        dfs(self.root, 0, [])
-        return results
+from indexed_heap import IndexedHeap
+from flat_grid import FlatGrid
+from slot_graph import compile_slot_graph
+from solver_stats import SolverStats
+from word_index import WordIndex, popcount
 
 
 def load_dictionary(min_level=None, max_level=None, include_tags=None):
@@ -68,23 +27,18 @@ def load_dictionary(min_level=None, max_level=None, include_tags=None):
     Returns:
         List of uppercase word strings.
     """
-    if not DICT_PATH.exists():
-        raise FileNotFoundError(f"Dictionary not found: {DICT_PATH}")
-    data = json.loads(DICT_PATH.read_text(encoding="utf-8"))
-    all_words = data.get("words", {})
-
+    provider = get_provider()
+    provider.refresh()
     result = []
-    for word, entry in all_words.items():
+    for word, word_level, exclude_default, word_tags in provider.rows():
         # Skip soft-excluded words unless their tags are explicitly requested
-        if entry.get("excludeDefault", False):
+        if exclude_default:
             if not include_tags:
                 continue
-            word_tags = set(entry.get("tags", []))
-            if not word_tags.intersection(include_tags):
+            if not set(word_tags).intersection(include_tags):
                 continue
 
         # Apply level filter
-        word_level = entry.get("level")
         if min_level is not None and word_level is not None and word_level < min_level:
             continue
         if max_level is not None and word_level is not None and word_level > max_level:
@@ -95,11 +49,41 @@ def load_dictionary(min_level=None, max_level=None, include_tags=None):
     return result
 
 
-def build_tries(words):
-    tries = {}
-    for w in words:
-        tries.setdefault(len(w), Trie()).insert(w)
-    return tries
+def build_index(words):
+    return WordIndex(words)
+
+
+INDEX_BACKENDS = ("bitset", "numpy")
+
+
+def index_from_entries(entries, backend="bitset"):
+    """Build a word index from (word, level, tags, exclude_default) entries.
+
+    backend "numpy" builds a numpy_index.NumpyWordIndex (needs numpy); both
+    answer the same queries with the same word ids.
+    """
+    if backend == "numpy":
+        from numpy_index import NumpyWordIndex
+        return NumpyWordIndex(entries)
+    if backend != "bitset":
+        raise ValueError(f"Unknown index backend {backend!r}; expected one of {INDEX_BACKENDS}")
+    index = WordIndex()
+    for word, level, tags, exclude_default in entries:
+        index.add(word, level=level, tags=tags, exclude_default=exclude_default)
+    return index
+
+
+def build_level_index(backend="bitset"):
+    """Index every dictionary word with its level and tags.
+
+    Use .view(min_level, max_level, include_tags) to get the same words as
+    load_dictionary() with those filters, without rebuilding anything.
+    """
+    provider = get_provider()
+    provider.refresh()
+    entries = ((word.upper(), level, tags, exclude_default)
+               for word, level, exclude_default, tags in provider.rows())
+    return index_from_entries(entries, backend)
 
 
 def parse_grid(template, size=None):
@@ -212,36 +196,6 @@ def extract_slots(grid):
     return slots
 
 
-def get_pattern(grid, slot):
-    pattern = []
-    for r, c in slot["positions"]:
-        ch = grid[r][c]
-        if ch == '.':
-            pattern.append(None)
-        else:
-            pattern.append(ch)
-    return pattern
-
-
-def place_word(grid, slot, word):
-    changes = []
-    for (r, c), ch in zip(slot["positions"], word):
-        cur = grid[r][c]
-        if cur == '.':
-            grid[r][c] = ch
-            changes.append((r, c))
-        elif cur != ch:
-            for rr, cc in changes:
-                grid[rr][cc] = '.'
-            return None
-    return changes
-
-
-def undo_changes(grid, changes):
-    for r, c in changes:
-        grid[r][c] = '.'
-
-
 def count_whites(grid):
     return sum(1 for row in grid for ch in row if ch != '#')
 
@@ -253,77 +207,258 @@ def count_words_by_dir(slots):
 
 
 def validate_full_grid(grid):
-    rows = len(grid)
-    cols = len(grid[0]) if rows else 0
-    for r in range(rows):
-        for c in range(cols):
-            if grid[r][c] == '#':
-                continue
-            across, down = cell_word_lengths(grid, r, c)
-            if across < 3 and down < 3:
-                return False
-    return True
+    """True if every white cell is in a word of 3+ letters (list grid or FlatGrid)."""
+    flat = grid if isinstance(grid, FlatGrid) else FlatGrid(grid)
+    return flat.is_valid()
 
 
-def solve(grid, slots, tries, max_nodes=200000, allow_reuse=False, used_global=None):
-    used = set()
-    nodes = 0
+def solve(grid, slots, index, max_nodes=200000, allow_reuse=False, used_global=None,
+          forward_check=True, graph=None, backjump=False, nogood_limit=4096, lcv=True,
+          stats=None):
+    """Fill grid in place by backtracking. Returns True on success.
 
-    def candidates_for(slot):
-        trie = tries.get(slot["length"])
-        if not trie:
-            return []
-        pattern = get_pattern(grid, slot)
-        words = trie.search_pattern(pattern)
+    graph is the compiled SlotGraph for slots (built if omitted). max_nodes
+    caps the search; forward_check, backjump (keeping at most nogood_limit
+    nogoods) and lcv switch those techniques on. Search counters are added
+    to stats (a SolverStats) if given.
+    """
+    if graph is None:
+        graph = compile_slot_graph(grid, slots)
+    nodes = 0
+    # backtracks, candidate queries, candidates, failed placements, nogood hits
+    tally = [0, 0, 0, 0, 0]
+    n = len(slots)
+    lengths = graph.lengths
+    neighbors = graph.neighbors
+    same_length = graph.same_length
+
+    excluded = {}  # length -> mask of words that may not be placed
+    if used_global:
+        for w in used_global:
+            excluded[len(w)] = excluded.get(len(w), 0) | index.word_bit(w)
+    hits, misses = index.cache_hits, index.cache_misses
+    # Patterns are read from a FlatGrid copy; the fill is written back only once solved
+    flat = FlatGrid(grid)
+    cells = graph.cells
+    # Each slot's live domain: a bitmask over the index words of its length
+    domains = [index.match(flat.pattern(cells[i])) & ~excluded.get(lengths[i], 0)
+               for i in range(n)]
+    if stats is not None:
+        stats.add("cache_hits", index.cache_hits - hits)
+        stats.add("cache_misses", index.cache_misses - misses)
+    assigned = [None] * n  # word placed in each slot
+    values = [None] * n  # per assigned slot: its nogood value (see below)
+    # Placements write no cells, they narrow crossing domains; the old masks
+    # go on the trail, so undoing a placement is a pop
+    trail = []  # (slot index, previous domain)
+    reasons = [[] for _ in range(n)]  # assigned slots that narrowed each domain
+    # MRV: unassigned slots in a heap keyed by domain size, re-keyed lazily in select()
+    queue = IndexedHeap(n)
+    for i in range(n):
+        queue.push(i, popcount(domains[i]))
+    dirty = []  # slots whose domain changed since the last selection
+    is_dirty = [False] * n
+
+    cross_offsets = [sorted({off for off, _, _ in neighbors[i]}) for i in range(n)]
+    # LCV: value_buckets() order words by how common their letters are at the
+    # crossing positions; words are shuffled only within a bucket
+    if lcv:
+        buckets = [
+            index.value_buckets(lengths[i], tuple(sorted(
+                (off, lengths[j], j_off) for off, j, j_off in neighbors[i])))
+            for i in range(n)
+        ]
+    # Backjumping: a failure's conflict set is the assigned slots that narrowed the
+    # failing domains. An exhausted slot's conflict set is kept as a nogood on the
+    # culprits' crossing letters (words, without reuse), in an LRU of nogood_limit
+    nogoods = OrderedDict()  # key -> None, oldest first
+    watches = {}  # (slot, value) -> {nogood key: None}, insertion ordered
+
+    def narrow(i, j, mask):
+        # With forward_check, a wiped-out domain fails the placement at once
+        old = domains[j]
+        new = old & mask
+        if new != old:
+            trail.append((j, old))
+            if backjump:
+                reasons[j].append(i)
+            domains[j] = new
+            if not is_dirty[j]:
+                is_dirty[j] = True
+                dirty.append(j)
+        return new or not forward_check
+
+    def propagate(i, word):
+        """Narrow the domains i constrains. Returns a wiped-out slot or None."""
+        for off, j, j_off in neighbors[i]:
+            if not assigned[j] and not narrow(i, j, index.position_mask(lengths[j], j_off, word[off])):
+                return j
         if not allow_reuse:
-            words = [w for w in words if w not in used]
-        if used_global:
-            words = [w for w in words if w not in used_global]
-        random.shuffle(words)
-        if len(words) > 500:
-            words = words[:500]
-        return words
-
-    def backtrack(remaining):
+            bit = index.word_bit(word)
+            for j in same_length[i]:
+                if not assigned[j] and not narrow(i, j, ~bit):
+                    return j
+        return None
+
+    def unassign(i, mark):
+        while len(trail) > mark:
+            j, old = trail.pop()
+            if backjump:
+                reasons[j].pop()
+            domains[j] = old
+            if not is_dirty[j]:
+                is_dirty[j] = True
+                dirty.append(j)
+        assigned[i] = None
+        values[i] = None
+
+    def select():
+        """Re-key slots whose domain changed, then return (slot, size) or None."""
+        sizes = queue.prio
+        for j in dirty:
+            is_dirty[j] = False
+            if not assigned[j]:
+                size = popcount(domains[j])
+                if size != sizes[j]:
+                    queue.update(j, size)
+        dirty.clear()
+        return queue.peek()
+
+    def nogood_value(i, word):
+        if not allow_reuse:
+            return word
+        return "".join(word[off] for off in cross_offsets[i])
+
+    def record_nogood(conflicts):
+        key = tuple((j, values[j]) for j in sorted(conflicts))
+        if key in nogoods:
+            nogoods.move_to_end(key)
+            return
+        nogoods[key] = None
+        for pair in key:
+            watches.setdefault(pair, {})[key] = None
+        if len(nogoods) > nogood_limit:
+            stale, _ = nogoods.popitem(last=False)
+            for pair in stale:
+                keys = watches[pair]
+                del keys[stale]
+                if not keys:
+                    del watches[pair]
+
+    def matching_nogood(i):
+        for key in watches.get((i, values[i]), ()):
+            for j, value in key:
+                if values[j] != value:
+                    break
+            else:
+                nogoods.move_to_end(key)
+                return key
+        return None
+
+    def assign(i, word, conflicts):
+        """Place word in slot i. Returns the trail mark, or None on conflict.
+
+        With backjump, the culprit slots of a failure are added to conflicts.
+        """
+        mark = len(trail)
+        assigned[i] = word
+        if backjump:
+            values[i] = nogood_value(i, word)
+            hit = matching_nogood(i)
+            if hit is not None:
+                tally[3] += 1
+                tally[4] += 1
+                conflicts.update(j for j, _ in hit)
+                unassign(i, mark)
+                return None
+        wiped = propagate(i, word)
+        if wiped is not None:
+            tally[3] += 1
+            if backjump:
+                conflicts.update(reasons[wiped])
+            unassign(i, mark)
+            return None
+        return mark
+
+    def candidates_for(i):
+        """Yield the words of slot i's domain lazily, in random order.
+
+        With lcv the value buckets are walked best first, each in random
+        order. Words are drawn only as they are tried.
+        """
+        tally[1] += 1
+        domain = domains[i]
+        if not lcv:
+            yield from index.iter_random(lengths[i], domain)
+            return
+        for bucket in buckets[i]:
+            part = domain & bucket
+            if part:
+                yield from index.iter_random(lengths[i], part)
+
+    def backtrack():
+        """Returns True when solved, else False (or, with backjump, the
+        conflict set of the failure)."""
         nonlocal nodes
         nodes += 1
         if nodes > max_nodes:
             return False
-        if not remaining:
-            return True
-
-        best_idx = None
-        best_cands = None
-        best_count = None
-        for i, slot in enumerate(remaining):
-            cands = candidates_for(slot)
-            cnt = len(cands)
-            if cnt == 0:
-                return False
-            if best_count is None or cnt < best_count:
-                best_count = cnt
-                best_idx = i
-                best_cands = cands
-            if best_count == 1:
-                break
 
-        slot = remaining.pop(best_idx)
-        for w in best_cands:
-            changes = place_word(grid, slot, w)
-            if changes is None:
+        top = select()
+        if top is None:
+            return True
+        best, best_count = top
+        if best_count == 0:
+            return set(reasons[best]) if backjump else False
+
+        queue.remove(best)
+        conflicts = set()
+        jump = None
+        for w in candidates_for(best):
+            tally[2] += 1
+            placed = assign(best, w, conflicts)
+            if placed is None:
                 continue
-            if not allow_reuse:
-                used.add(w)
-            if backtrack(remaining):
+            result = backtrack()
+            if result is True:
                 return True
-            if not allow_reuse:
-                used.remove(w)
-            undo_changes(grid, changes)
-
-        remaining.insert(best_idx, slot)
-        return False
-
-    return backtrack(slots[:])
+            unassign(best, placed)
+            tally[0] += 1
+            if nodes > max_nodes:
+                break
+            if backjump:
+                if best not in result:
+                    jump = result
+                    break
+                conflicts.update(result)
+        queue.push(best, best_count)
+
+        if not backjump or nodes > max_nodes:
+            return False
+        if jump is not None:
+            return jump
+        conflicts.update(reasons[best])
+        conflicts.discard(best)
+        if conflicts:
+            record_nogood(conflicts)
+        return conflicts
+
+    solved = backtrack() is True
+    if solved:
+        for i in range(n):
+            flat.place(cells[i], assigned[i].encode("ascii"))
+        flat.write_to(grid)
+    if stats is not None:
+        counters = stats.counters
+        counters["solve_calls"] += 1
+        counters["nodes"] += min(nodes, max_nodes)
+        counters["pattern_queries"] += n
+        counters["backtracks"] += tally[0]
+        counters["candidate_queries"] += tally[1]
+        counters["candidates"] += tally[2]
+        counters["failed_placements"] += tally[3]
+        counters["nogood_hits"] += tally[4]
+    return solved
 
 
 def print_grid(grid):
@@ -332,49 +467,196 @@ def print_grid(grid):
 
 
 def slot_word(grid, slot):
+    if isinstance(grid, FlatGrid):
+        return grid.word(grid.slot_cells(slot))
     return "".join(grid[r][c] for r, c in slot["positions"])
 
 
-def generate_one(templates, tries, size, used_global=None, max_attempts=500):
-    for _ in range(max_attempts):
-        template = random.choice(templates)
-        grid = parse_grid(template, size=size)
-        sanitize_grid(grid)
-        if not is_connected(grid):
-            continue
+def luby(i):
+    """Return the i-th term (1-based) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
 
-        slots = extract_slots(grid)
-        # skip templates with slot lengths not in dictionary
-        if any(s["length"] not in tries for s in slots):
-            continue
 
+def node_budgets(schedule, unit, cap):
+    """Yield the node limit for each successive solve attempt.
+
+    schedule is "luby" (unit * luby(i)), "geometric" (unit * 1.5**i) or
+    "fixed" (always cap). Every budget is clamped to cap.
+    """
+    i = 0
+    while True:
+        i += 1
+        if schedule == "luby":
+            budget = unit * luby(i)
+        elif schedule == "geometric":
+            budget = unit * 1.5 ** (i - 1)
+        elif schedule == "fixed":
+            budget = cap
+        else:
+            raise ValueError(f"Unknown restart schedule: {schedule}")
+        yield min(int(budget), cap)
+
+
+# Size-specific template filters: (minimum white ratio, minimum across and down words).
+SIZE_RULES = {
+    5: (0.68, 2),
+    7: (0.60, 3),
+    9: (0.55, 4),
+}
+
+
+class CompiledTemplate:
+    """A template parsed, sanitized and checked once.
+
+    Attributes:
+        template: The source template rows.
+        rows: The sanitized grid as a tuple of row strings.
+        id: Short stable hash of rows, used to key per-template statistics.
+        slots: extract_slots() of the sanitized grid.
+        graph: The compiled SlotGraph for slots.
+        valid: Whether the template passes the size-specific filters.
+        reason: Why it was rejected, or None.
+    """
+
+    __slots__ = ("template", "size", "rows", "id", "slots", "graph", "valid", "reason")
+
+    def __init__(self, template, size, rows, slots, graph, reason):
+        self.template = template
+        self.size = size
+        self.rows = rows
+        self.id = hashlib.sha1("\n".join(rows).encode("ascii")).hexdigest()[:12]
+        self.slots = slots
+        self.graph = graph
+        self.valid = reason is None
+        self.reason = reason
+
+    def new_grid(self):
+        """Return a fresh mutable grid to fill."""
+        return [list(row) for row in self.rows]
+
+
+_COMPILED = {}  # (size, template rows) -> CompiledTemplate
+
+
+def compile_template(template, size):
+    """Return the cached CompiledTemplate for template at size."""
+    key = (size, tuple(template))
+    compiled = _COMPILED.get(key)
+    if compiled is not None:
+        return compiled
+
+    grid = parse_grid(template, size=size)
+    sanitize_grid(grid)
+    slots = extract_slots(grid)
+    reason = None
+    if not is_connected(grid):
+        reason = "disconnected"
+    elif size in SIZE_RULES:
+        min_ratio, min_words = SIZE_RULES[size]
         across, down = count_words_by_dir(slots)
-        total_cells = len(grid) * len(grid[0])
-        white_ratio = count_whites(grid) / total_cells
+        white_ratio = count_whites(grid) / (len(grid) * len(grid[0]))
+        if white_ratio < min_ratio:
+            reason = f"white ratio {white_ratio:.2f} < {min_ratio}"
+        elif across < min_words or down < min_words:
+            reason = f"{across} across / {down} down < {min_words}"
+    compiled = CompiledTemplate(key[1], size, tuple("".join(row) for row in grid),
+                                slots, compile_slot_graph(grid, slots), reason)
+    _COMPILED[key] = compiled
+    return compiled
+
+
+_USABLE = weakref.WeakKeyDictionary()  # index -> {(size, templates): [CompiledTemplate]}
 
-        if size == 5:
-            if white_ratio < 0.68:
-                continue
-            if across < 2 or down < 2:
-                continue
-        elif size == 7:
-            if white_ratio < 0.60:
-                continue
-            if across < 3 or down < 3:
-                continue
-        elif size == 9:
-            if white_ratio < 0.55:
-                continue
-            if across < 4 or down < 4:
-                continue
 
-        allow_reuse = (size <= 5)
-        node_limit = 80000 if size <= 5 else 200000
-        ok = solve(grid, slots, tries, allow_reuse=allow_reuse, used_global=used_global, max_nodes=node_limit)
-        if ok and validate_full_grid(grid):
+def usable_templates(templates, size, index, stats=None):
+    """Return the compiled templates that pass the filters and fit the index.
+
+    A template is unusable with index if it has a slot length the index has
+    no words for. The result is cached per index, so with stats the reason
+    each template was dropped is recorded only when it is first computed.
+    """
+    cached = _USABLE.setdefault(index, {})
+    key = (size, tuple(map(tuple, templates)))
+    usable = cached.get(key)
+    if stats is not None:
+        stats.add("template_cache_hits" if usable is not None else "template_cache_misses")
+    if usable is not None:
+        return usable
+
+    usable = []
+    for template in templates:
+        compiled = compile_template(template, size)
+        if not compiled.valid:
+            if stats is not None:
+                stats.reject(f"template: {compiled.reason}")
+            continue
+        missing = [s["length"] for s in compiled.slots if s["length"] not in index]
+        if missing:
+            if stats is not None:
+                stats.reject(f"template: no {missing[0]}-letter words")
+            continue
+        usable.append(compiled)
+    cached[key] = usable
+    return usable
+
+
+def generate_one(templates, index, size, used_global=None, max_attempts=500,
+                 restarts="luby", backjump=True, forward_check=True, scheduler=None,
+                 stats=None):
+    """Fill a random template, restarting on a fresh template per attempt.
+
+    Templates are picked by scheduler (a TemplateScheduler) if given, else
+    uniformly. Returns the grid or None. stats (a SolverStats) receives the
+    search counters, template attempts, rejections and stage times.
+    """
+    if stats is None:
+        stats = SolverStats()
+    allow_reuse = (size <= 5)
+    node_limit = 80000 if size <= 5 else 200000
+    unit = 1000 if size <= 5 else 2000
+    # Restarts: each attempt gets the next budget of the schedule, so hopeless
+    # templates are dropped early while later attempts can still search deeply
+    budgets = node_budgets(restarts, unit, node_limit)
+    with stats.stage("compile templates"):
+        usable = usable_templates(templates, size, index, stats)
+    if not usable:
+        return None
+    counters = stats.counters
+    for _ in range(max_attempts):
+        if scheduler is not None:
+            compiled = scheduler.choose(usable, index, size)
+        else:
+            compiled = random.choice(usable)
+        grid = compiled.new_grid()
+        slots = compiled.slots
+        nodes_before = counters["nodes"]
+        with stats.stage("solve"):
+            ok = solve(grid, slots, index, allow_reuse=allow_reuse, used_global=used_global,
+                       max_nodes=next(budgets), graph=compiled.graph, backjump=backjump,
+                       forward_check=forward_check, stats=stats)
+        if ok:
+            with stats.stage("validate"):
+                ok = validate_full_grid(grid)
+            if not ok:
+                stats.reject("attempt: fill fails validation")
+        else:
+            stats.reject("attempt: no fill within node budget")
+        stats.attempt(f"{size}x{size}/{compiled.id}", ok)
+        if scheduler is not None:
+            scheduler.record(compiled, index, size, ok, counters["nodes"] - nodes_before)
+        if ok:
             if used_global is not None:
                 puzzle_words = {slot_word(grid, s) for s in slots}
                 if puzzle_words & used_global:
+                    stats.reject("attempt: repeats words used by another puzzle")
                     continue
                 used_global.update(puzzle_words)
             return grid
@@ -398,7 +680,7 @@ def main():
         templates = [templates[args.template]]
 
     words = load_dictionary()
-    tries = build_tries(words)
+    index = build_index(words)
 
     count = args.count
     if count is None:
@@ -406,7 +688,7 @@ def main():
 
     used_global = set()
     for i in range(count):
-        grid = generate_one(templates, tries, args.size, used_global=used_global)
+        grid = generate_one(templates, index, args.size, used_global=used_global)
         if not grid:
             raise SystemExit("Failed to generate a valid grid")
         print_grid(grid)
@@ -0,0 +1,119 @@
+"""Counters and stage timings for puzzle generation.
+
+A SolverStats is passed down through generate_one(), solve() and
+build_puzzle(); each adds to it what it did. Stats of several puzzles (or
+worker processes) combine with merge(), and round-trip through as_dict() /
+from_dict() so workers can return them as plain data.
+"""
+
+import time
+from contextlib import contextmanager
+
+COUNTERS = (
+    "nodes",              # backtrack() calls
+    "backtracks",         # placements undone after their subtree failed
+    "pattern_queries",    # index.match() calls for initial slot domains
+    "candidate_queries",  # candidate iterators opened for a chosen slot
+    "candidates",         # words actually drawn from those iterators
+    "failed_placements",  # placements rejected at once (clash, wipe-out, nogood)
+    "nogood_hits",        # placements pruned by the nogood cache
+    "cache_hits",         # index pattern lookups answered from cache
+    "cache_misses",       # index pattern lookups computed
+    "template_cache_hits",    # usable_templates() results answered from cache
+    "template_cache_misses",  # usable_templates() results computed
+    "solve_calls",
+    "puzzles",
+)
+
+
+class SolverStats:
+    """Accumulated generation statistics.
+
+    Attributes:
+        counters: COUNTERS name -> int.
+        templates: Template id -> {"attempts": int, "successes": int}.
+        rejections: Reason -> number of templates or attempts rejected for it.
+        stages: Stage name -> wall seconds.
+    """
+
+    def __init__(self):
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.templates = {}
+        self.rejections = {}
+        self.stages = {}
+
+    def add(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reject(self, reason):
+        self.rejections[reason] = self.rejections.get(reason, 0) + 1
+
+    def attempt(self, template, solved):
+        row = self.templates.setdefault(template, {"attempts": 0, "successes": 0})
+        row["attempts"] += 1
+        if solved:
+            row["successes"] += 1
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block and add it to stage name."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def merge(self, other):
+        """Add the counts and timings of other (a SolverStats or as_dict()) to self."""
+        if isinstance(other, SolverStats):
+            other = other.as_dict()
+        for name, value in other.get("counters", {}).items():
+            self.add(name, value)
+        for template, row in other.get("templates", {}).items():
+            mine = self.templates.setdefault(template, {"attempts": 0, "successes": 0})
+            mine["attempts"] += row["attempts"]
+            mine["successes"] += row["successes"]
+        for reason, count in other.get("rejections", {}).items():
+            self.rejections[reason] = self.rejections.get(reason, 0) + count
+        for name, seconds in other.get("stages", {}).items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        return self
+
+    def as_dict(self):
+        return {
+            "counters": dict(self.counters),
+            "templates": {t: dict(row) for t, row in self.templates.items()},
+            "rejections": dict(self.rejections),
+            "stages": dict(self.stages),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls().merge(data)
+
+    def summary(self):
+        """Return a human-readable multi-line summary."""
+        c = self.counters
+        lines = ["Solver stats:"]
+        for name in COUNTERS:
+            lines.append(f"  {name:<22} {c.get(name, 0):>12}")
+        if c.get("nodes"):
+            lines.append(f"  {'backtrack rate':<22} {c['backtracks'] / c['nodes']:>12.1%}")
+        if c.get("candidate_queries"):
+            per_query = c["candidates"] / c["candidate_queries"]
+            lines.append(f"  {'candidates/query':<22} {per_query:>12.1f}")
+        if self.stages:
+            lines.append("Stages (wall seconds):")
+            for name, seconds in sorted(self.stages.items(), key=lambda kv: -kv[1]):
+                lines.append(f"  {name:<22} {seconds:>12.3f}")
+        if self.rejections:
+            lines.append("Rejections:")
+            for reason, count in sorted(self.rejections.items(), key=lambda kv: -kv[1]):
+                lines.append(f"  {count:>6}  {reason}")
+        if self.templates:
+            lines.append("Templates (attempts, success rate):")
+            ranked = sorted(self.templates.items(), key=lambda kv: -kv[1]["attempts"])
+            for template, row in ranked:
+                rate = row["successes"] / row["attempts"] if row["attempts"] else 0.0
+                lines.append(f"  {template:<24} {row['attempts']:>6} {rate:>7.0%}")
+        return "\n".join(lines)
@@ -0,0 +1,124 @@
+"""Learn which templates fill for which word lists, and pick templates accordingly.
+
+Some templates almost never fill from a narrow exam word list, and picking
+them uniformly wastes most of the solve budget. TemplateScheduler keeps
+attempt, success and node counts per (size, exam range, template) and picks
+templates by Thompson sampling: each usable template draws a success rate
+from Beta(successes + 1, failures + 1) and the highest draw is solved next.
+Templates that keep failing are tried less often but never ruled out, and a
+fixed share of picks stays uniform so puzzles keep some variety. Node
+counts are kept alongside so the cost of each template can be inspected in
+the stats file.
+
+Counts are saved to a small JSON file between runs. A scheduler separates
+the counts it was loaded with (base) from those it recorded itself (delta),
+so workers can each start from the same file and hand their deltas back to
+be merged; choices then do not depend on how jobs are spread over workers.
+"""
+
+import json
+import os
+import random
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+STATS_PATH = ROOT / "backend" / "generator" / "template_stats.json"
+STATS_VERSION = 1
+
+FIELDS = ("attempts", "successes", "nodes")
+
+
+def template_id(compiled):
+    """Return the short stable id of a compiled template (a hash of its rows)."""
+    return compiled.id
+
+
+def range_key(index, size):
+    """Describe the word list of index (an IndexView or a plain WordIndex) at size."""
+    key = getattr(index, "key", None)
+    if key is None:
+        return f"{size}x{size} all"
+    min_level, max_level, tags = key
+    desc = f"{size}x{size} levels {min_level or 'any'}-{max_level or 'any'}"
+    if tags:
+        desc += " tags " + ",".join(sorted(tags))
+    return desc
+
+
+def load_stats(path=STATS_PATH):
+    """Return the stats stored at path, or {} if it is missing or unreadable."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != STATS_VERSION:
+        return {}
+    return data.get("ranges", {})
+
+
+def save_stats(stats, path=STATS_PATH):
+    """Write stats to path atomically."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"version": STATS_VERSION, "ranges": stats}, indent=1,
+                              sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def merge_stats(stats, delta):
+    """Add the counts of delta into stats in place and return stats."""
+    for key, templates in delta.items():
+        bucket = stats.setdefault(key, {})
+        for tid, counts in templates.items():
+            row = bucket.setdefault(tid, dict.fromkeys(FIELDS, 0))
+            for field in FIELDS:
+                row[field] = row.get(field, 0) + counts.get(field, 0)
+    return stats
+
+
+class TemplateScheduler:
+    """Bandit template picker for generate_one().
+
+    Attributes:
+        base: Counts loaded at start; never modified.
+        delta: Counts recorded by this scheduler.
+        explore: Share of picks made uniformly at random.
+    """
+
+    def __init__(self, base=None, explore=0.1):
+        self.base = base or {}
+        self.delta = {}
+        self.explore = explore
+
+    def counts(self, key, tid):
+        """Return (attempts, successes, nodes) for a template, base plus delta."""
+        total = [0, 0, 0]
+        for source in (self.base, self.delta):
+            row = source.get(key, {}).get(tid)
+            if row:
+                for k, field in enumerate(FIELDS):
+                    total[k] += row.get(field, 0)
+        return tuple(total)
+
+    def choose(self, usable, index, size):
+        """Pick one of the usable compiled templates."""
+        if len(usable) == 1 or random.random() < self.explore:
+            return random.choice(usable)
+        key = range_key(index, size)
+        best = None
+        best_draw = -1.0
+        for compiled in usable:
+            attempts, successes, _ = self.counts(key, template_id(compiled))
+            draw = random.betavariate(successes + 1, attempts - successes + 1)
+            if draw > best_draw:
+                best, best_draw = compiled, draw
+        return best
+
+    def record(self, compiled, index, size, solved, nodes):
+        """Count one solve attempt of compiled and the nodes it used."""
+        bucket = self.delta.setdefault(range_key(index, size), {})
+        row = bucket.setdefault(template_id(compiled), dict.fromkeys(FIELDS, 0))
+        row["attempts"] += 1
+        row["successes"] += 1 if solved else 0
+        row["nodes"] += nodes
+
@@ -0,0 +1,266 @@
+"""Positional bitset index for crossword pattern lookup.
+
+Words of each length are numbered 0..n-1. For every (length, position, letter)
+the index keeps a Python int whose bit ``i`` is set when word ``i`` has that
+letter at that position. The candidates for a pattern are then the AND of one
+mask per fixed letter, and their count is a popcount.
+
+Words can carry a difficulty level and tags. The index keeps per-length
+level and tag masks, so one index built over the whole dictionary can serve
+any level range or tag set through view(), which only ANDs in a filter mask
+at query time.
+
+Pattern queries go through a small LRU cache per index or view, keyed by
+the pattern; it is cleared whenever words are added.
+"""
+
+import random
+from collections import OrderedDict
+
+try:
+    (0).bit_count
+
+    def popcount(mask):
+        return mask.bit_count()
+except AttributeError:  # Python < 3.10
+    def popcount(mask):
+        return bin(mask).count("1")
+
+
+def iter_ids(mask):
+    """Yield the ids of the set bits in mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class WordIndex:
+    match_cache_size = 4096
+
+    def __init__(self, words=()):
+        self.words = {}       # length -> [word, ...] (id = list position)
+        self.ids = {}         # word -> id within its length class
+        self.full = {}        # length -> mask of the words this index answers with
+        self.positions = {}   # length -> [{letter: mask}, ...] per position
+        self.levels = {}      # length -> {level or None: mask}
+        self.tags = {}        # length -> {tag: mask}
+        self.hidden = {}      # length -> mask of excludeDefault words
+        self._counts = {}     # length -> per-position {letter: count}, cached
+        self._buckets = {}    # (length, crossings) -> value_buckets(), cached
+        self._views = {}      # view key -> IndexView, cached
+        self._matches = OrderedDict()  # pattern tuple -> mask, LRU
+        self.cache_hits = 0
+        self.cache_misses = 0
+        for w in words:
+            self.add(w)
+
+    def add(self, word, level=None, tags=(), exclude_default=False):
+        if word in self.ids:
+            return
+        length = len(word)
+        bucket = self.words.setdefault(length, [])
+        word_id = len(bucket)
+        bucket.append(word)
+        self.ids[word] = word_id
+        bit = 1 << word_id
+        self.full[length] = self.full.get(length, 0) | bit
+        columns = self.positions.setdefault(length, [{} for _ in range(length)])
+        for pos, ch in enumerate(word):
+            col = columns[pos]
+            col[ch] = col.get(ch, 0) | bit
+        by_level = self.levels.setdefault(length, {})
+        by_level[level] = by_level.get(level, 0) | bit
+        by_tag = self.tags.setdefault(length, {})
+        for tag in tags:
+            by_tag[tag] = by_tag.get(tag, 0) | bit
+        if exclude_default:
+            self.hidden[length] = self.hidden.get(length, 0) | bit
+        self._counts.pop(length, None)
+        self._buckets.clear()
+        self._views.clear()
+        self._matches.clear()
+
+    def __contains__(self, length):
+        return bool(self.full.get(length))
+
+    def __len__(self):
+        return sum(popcount(mask) for mask in self.full.values())
+
+    def letter_counts(self, length):
+        """Per position, {letter: number of words with that letter there}.
+
+        Counts cover this index's words only (a view counts its own subset)
+        and are computed once per length.
+        """
+        table = self._counts.get(length)
+        if table is None:
+            full = self.full.get(length, 0)
+            table = [
+                {ch: popcount(mask & full) for ch, mask in col.items()}
+                for col in self.positions.get(length, ())
+            ]
+            self._counts[length] = table
+        return table
+
+    def value_buckets(self, length, crossings):
+        """Partition the words of length by how little they constrain crossings.
+
+        crossings is a tuple of (offset, other_length, other_offset). A word
+        scores the sum over crossings of the log2-bucketed letter_counts() of
+        its letter in the crossing slot's position. Returns the masks of equal
+        score, highest (least constraining) first. Cached per shape.
+        """
+        key = (length, crossings)
+        buckets = self._buckets.get(key)
+        if buckets is None:
+            weights = [
+                (off, {ch: count.bit_length()
+                       for ch, count in self.letter_counts(other_length)[other_off].items()})
+                for off, other_length, other_off in crossings
+            ]
+            by_score = {}
+            full = self.full.get(length, 0)
+            for word_id, word in enumerate(self.words.get(length, ())):
+                if not full >> word_id & 1:
+                    continue
+                score = sum(table.get(word[off], 0) for off, table in weights)
+                by_score[score] = by_score.get(score, 0) | (1 << word_id)
+            buckets = tuple(by_score[score] for score in sorted(by_score, reverse=True))
+            self._buckets[key] = buckets
+        return buckets
+
+    def view(self, min_level=None, max_level=None, include_tags=None):
+        """Return an IndexView with load_dictionary()'s filter semantics.
+
+        Words without a level pass any level bound; excludeDefault words are
+        included only if they carry one of include_tags. Views are cached, so
+        their derived tables (letter counts, value buckets) are built once.
+        """
+        key = (min_level, max_level, frozenset(include_tags) if include_tags else None)
+        cached = self._views.get(key)
+        if cached is not None:
+            return cached
+        allowed = {}
+        for length, by_level in self.levels.items():
+            mask = 0
+            for level, level_mask in by_level.items():
+                if level is not None:
+                    if min_level is not None and level < min_level:
+                        continue
+                    if max_level is not None and level > max_level:
+                        continue
+                mask |= level_mask
+            hidden = self.hidden.get(length, 0)
+            if include_tags:
+                by_tag = self.tags.get(length, {})
+                for tag in include_tags:
+                    hidden &= ~by_tag.get(tag, 0)
+            allowed[length] = mask & ~hidden & self.full[length]
+        view = self._views[key] = self._make_view(allowed, key)
+        return view
+
+    def _make_view(self, allowed, key):
+        return IndexView(self, allowed, key)
+
+    def match(self, pattern):
+        """Return the mask of words matching pattern (list of chars/None).
+
+        Results are memoized in an LRU cache of match_cache_size patterns;
+        cache_hits and cache_misses count its use.
+        """
+        key = tuple(pattern)
+        matches = self._matches
+        mask = matches.get(key)
+        if mask is not None:
+            matches.move_to_end(key)
+            self.cache_hits += 1
+            return mask
+        self.cache_misses += 1
+        mask = matches[key] = self._match(key)
+        if len(matches) > self.match_cache_size:
+            matches.popitem(last=False)
+        return mask
+
+    def _match(self, pattern):
+        length = len(pattern)
+        mask = self.full.get(length, 0)
+        if not mask:
+            return 0
+        columns = self.positions[length]
+        for pos, ch in enumerate(pattern):
+            if ch is not None:
+                mask &= columns[pos].get(ch, 0)
+                if not mask:
+                    return 0
+        return mask
+
+    def position_mask(self, length, pos, letter):
+        """Return the mask of words with letter at pos."""
+        columns = self.positions.get(length)
+        return columns[pos].get(letter, 0) if columns else 0
+
+    def word_bit(self, word):
+        """Return the single-bit mask for word, or 0 if it is not indexed."""
+        word_id = self.ids.get(word)
+        return 0 if word_id is None else 1 << word_id
+
+    def words_for(self, length, mask):
+        bucket = self.words.get(length, [])
+        return [bucket[i] for i in iter_ids(mask)]
+
+    def iter_random(self, length, mask):
+        """Yield the words of mask in uniform random order, one at a time.
+
+        While the remaining mask is dense, ids are drawn by rejection sampling
+        on its bit range, so nothing is materialised up front. Once it thins
+        out, the remaining ids are listed and shuffled incrementally.
+        """
+        bucket = self.words[length]
+        width = mask.bit_length()
+        left = popcount(mask)
+        randrange = random.randrange
+        while left and left * 4 >= width:
+            word_id = randrange(width)
+            bit = 1 << word_id
+            if mask & bit:
+                mask ^= bit
+                left -= 1
+                yield bucket[word_id]
+        ids = list(iter_ids(mask))
+        for k in range(len(ids)):
+            j = randrange(k, len(ids))
+            ids[k], ids[j] = ids[j], ids[k]
+            yield bucket[ids[k]]
+
+    def search_pattern(self, pattern):
+        """Return all words matching pattern, a list of letters and None for blanks."""
+        return self.words_for(len(pattern), self.match(pattern))
+
+
+class IndexView(WordIndex):
+    """A WordIndex restricted to a subset of its words.
+
+    Shares the parent's word tables and position masks; only ``full`` differs,
+    so match() and everything built on it see just the allowed words.
+    """
+
+    def __init__(self, parent, allowed, key=None):
+        self.parent = parent
+        self.key = key
+        self.words = parent.words
+        self.ids = parent.ids
+        self.positions = parent.positions
+        self.levels = parent.levels
+        self.tags = parent.tags
+        self.hidden = parent.hidden
+        self.full = allowed
+        self._counts = {}
+        self._buckets = {}
+        self._views = {}
+        self._matches = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add(self, word, level=None, tags=(), exclude_default=False):
+        raise TypeError("IndexView is read-only; add words to the parent WordIndex")
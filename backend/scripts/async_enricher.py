@@ -0,0 +1,322 @@
+"""Concurrent word enrichment with pooled connections, rate limits and retries.
+
+enricher.py used to fetch one definition, translate it and sleep half a
+second per word, so a run took as long as the sum of all round-trips.
+AsyncWordEnricher keeps up to `concurrency` words in flight:
+
+- Dictionary API requests share a pool of keep-alive http.client
+  connections (run in worker threads via asyncio.to_thread), so the TCP/TLS
+  handshake is paid once per connection rather than once per word.
+- A TokenBucket per service caps requests per second; throughput is bound
+  by the chosen rate, not by latency.
+- Transient failures (connection errors and timeouts, 429 and 5xx
+  responses, a translator's TransientTranslationError) are retried with full-jitter exponential backoff; anything
+  else, such as a bug raising TypeError, fails the word at once.
+- Definitions are translated in batches: whatever definitions were fetched
+  while the previous batch was being translated go to the translator
+  together, one rate-limited request per BATCH_CHARS of text that is not
+  already in the translation cache.
+- Results come back in input order, whatever order they finished in;
+  on_result sees each one as soon as its translation batch is done, so a
+  caller can checkpoint it (see checkpoint_journal.py). The calls for a
+  batch run together in a worker thread, so a blocking on_result (an
+  fsync per entry) does not stall the event loop.
+
+Only the standard library is used for HTTP, so the enricher runs against
+any server that answers like the dictionary API, e.g. a local stub in
+tests. The translator is a translation_cache.CachedTranslator (or anything
+with cached_many(texts) and translate_many(texts)); it runs in worker
+threads, and each thread gets its own from translator_factory since sqlite
+connections and deep_translator's translators are not shared safely.
+"""
+
+import asyncio
+import http.client
+import json
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlsplit
+
+from translation_cache import BATCH_CHARS, TransientTranslationError, batches
+
+DICT_API = "https://api.dictionaryapi.dev/api/v2/entries/en/"
+USER_AGENT = "crossword-master/1.0"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def censor_word(text, word):
+    """Blank out word in text so a clue does not give its answer away."""
+    if not text:
+        return text
+    pattern = re.compile(re.escape(word), re.IGNORECASE)
+    return pattern.sub("__", text)
+
+
+class TransientHTTPError(Exception):
+    """A response status worth retrying (rate limited or server error)."""
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+TRANSIENT_ERRORS = (OSError, http.client.HTTPException, TransientHTTPError,
+                    TransientTranslationError)
+
+
+class TokenBucket:
+    """Allow rate acquisitions per second on average, in bursts of up to burst.
+
+    A rate of 0 or None disables the limit.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.rate:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ConnectionPool:
+    """Up to size keep-alive connections to the host of base_url.
+
+    get() borrows an idle connection (or opens one), runs the request in a
+    worker thread and returns the connection to the pool; a connection that
+    failed is closed instead.
+    """
+
+    def __init__(self, base_url, size=8, timeout=10):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.netloc
+        self.prefix = parts.path
+        self.timeout = timeout
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+
+    def _connect(self):
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, timeout=self.timeout)
+
+    @staticmethod
+    def _fetch(conn, url):
+        conn.request("GET", url, headers={"User-Agent": USER_AGENT,
+                                          "Accept": "application/json"})
+        response = conn.getresponse()
+        body = response.read()
+        if response.will_close:
+            conn.close()  # reopened on the next request
+        return response.status, body
+
+    async def get(self, path):
+        """GET base_url + path; returns (status, body bytes)."""
+        async with self.slots:
+            conn = self.idle.pop() if self.idle else self._connect()
+            try:
+                status, body = await asyncio.to_thread(self._fetch, conn, self.prefix + path)
+            except BaseException:
+                conn.close()
+                raise
+            self.idle.append(conn)
+            return status, body
+
+    def close(self):
+        for conn in self.idle:
+            conn.close()
+        self.idle.clear()
+
+
+async def with_retries(call, retries=4, base_delay=0.5, max_delay=30.0, retry_on=TRANSIENT_ERRORS):
+    """Await call() until it succeeds, retrying errors in retry_on.
+
+    Attempt n waits a uniform random time in [0, min(max_delay,
+    base_delay * 2**n)] first, so clients that failed together do not
+    retry in lockstep. The last error is raised after retries retries.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await call()
+        except retry_on:
+            if attempt == retries:
+                raise
+            await asyncio.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+
+
+class AsyncWordEnricher:
+    """Fetch English definitions and Chinese translations for many words at once.
+
+    Attributes:
+        concurrency: Words in flight (also the size of the connection pool).
+        rate, translate_rate: Requests per second to the dictionary API and
+            to the translator (0 = unlimited).
+        retries: Retries per request after the first attempt.
+        batch_chars: Most characters of definitions per translation request.
+    """
+
+    def __init__(self, translator_factory, dict_api=DICT_API, concurrency=8, rate=5.0,
+                 translate_rate=5.0, retries=4, timeout=10, base_delay=0.5,
+                 batch_chars=BATCH_CHARS):
+        self.translator_factory = translator_factory
+        self.dict_api = dict_api
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.translate_rate = translate_rate
+        self.retries = retries
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.batch_chars = batch_chars
+        self._local = threading.local()
+
+    def _translator(self):
+        translator = getattr(self._local, "translator", None)
+        if translator is None:
+            translator = self._local.translator = self.translator_factory()
+        return translator
+
+    def _cached_sync(self, texts):
+        return self._translator().cached_many(texts)
+
+    def _translate_sync(self, texts):
+        return self._translator().translate_many(texts)
+
+    async def get_definition(self, word):
+        """Return the first definition of word, or None if the API has none."""
+        async def attempt():
+            await self.dict_bucket.acquire()
+            status, body = await self.pool.get(quote(word.lower()))
+            if status in RETRY_STATUS:
+                raise TransientHTTPError(status)
+            return status, body
+
+        status, body = await with_retries(attempt, self.retries, self.base_delay)
+        if status != 200:
+            return None
+        try:
+            return json.loads(body)[0]['meanings'][0]['definitions'][0]['definition']
+        except (ValueError, LookupError, TypeError):
+            return None
+
+    async def translate(self, texts):
+        """Return {text: translation} for texts, one request per batch of cache misses."""
+        translations = await asyncio.to_thread(self._cached_sync, texts)
+        missing = [text for text in dict.fromkeys(texts) if text not in translations]
+        for batch in batches(missing, self.batch_chars):
+            async def attempt(batch=batch):
+                await self.translate_bucket.acquire()
+                return await asyncio.to_thread(self._translate_sync, batch)
+
+            translations.update(await with_retries(attempt, self.retries, self.base_delay))
+        return translations
+
+    async def enrich(self, words, on_result=None):
+        """Enrich words; returns {WORD: {"en", "zh"}} in input order.
+
+        on_result(WORD, entry), when given, is called for each enriched word
+        as soon as its translation batch completes, from a worker thread.
+        """
+        words = [w.upper() for w in words]
+        results = [None] * len(words)
+        pending = iter(range(len(words)))
+        definitions = asyncio.Queue()  # (index, definition), then None when all are fetched
+        completed = 0
+
+        def finish(i, entry):
+            nonlocal completed
+            results[i] = entry
+            completed += 1
+            status = "ok" if entry else "no result"
+            print(f"  [{completed}/{len(words)}] {words[i]} {status}", flush=True)
+
+        def report(done):
+            for word, entry in done:
+                on_result(word, entry)
+
+        async def fetcher():
+            for i in pending:
+                try:
+                    definition = await self.get_definition(words[i])
+                except Exception as e:
+                    print(f"  Error fetching definition for {words[i]}: {e}")
+                    definition = None
+                if definition:
+                    await definitions.put((i, definition))
+                else:
+                    finish(i, None)
+
+        async def fetch_all():
+            await asyncio.gather(*(fetcher() for _ in range(self.concurrency)))
+            await definitions.put(None)
+
+        async def translator():
+            # Take whatever definitions are waiting, up to batch_chars, as one batch
+            while True:
+                item = await definitions.get()
+                if item is None:
+                    return
+                batch, size = [item], len(item[1])
+                while size < self.batch_chars and not definitions.empty():
+                    item = definitions.get_nowait()
+                    if item is None:
+                        definitions.put_nowait(None)  # end after this batch
+                        break
+                    batch.append(item)
+                    size += len(item[1])
+                await translate_batch(batch)
+
+        async def translate_batch(batch):
+            try:
+                translations = await self.translate([definition for _, definition in batch])
+            except Exception as e:
+                print(f"  Error translating {words[batch[0][0]]}..{words[batch[-1][0]]}: {e}")
+                translations = {}
+            done = []
+            for i, definition in batch:
+                translation = translations.get(definition)
+                entry = None
+                if translation:
+                    entry = {
+                        "en": censor_word(definition, words[i]),
+                        "zh": censor_word(translation, words[i]),
+                    }
+                    done.append((words[i], entry))
+                finish(i, entry)
+            if on_result and done:
+                await asyncio.to_thread(report, done)
+
+        self.pool = ConnectionPool(self.dict_api, self.concurrency, self.timeout)
+        self.dict_bucket = TokenBucket(self.rate, burst=self.concurrency)
+        self.translate_bucket = TokenBucket(self.translate_rate)
+        try:
+            await asyncio.gather(fetch_all(), translator())
+        finally:
+            self.pool.close()
+        return {w: r for w, r in zip(words, results) if r}
+
+    def enrich_words(self, words, on_result=None):
+        """Run enrich() in a fresh event loop with one worker thread per word in flight."""
+        async def run():
+            loop = asyncio.get_running_loop()
+            # One thread per HTTP request in flight, plus one for the translator
+            executor = ThreadPoolExecutor(max_workers=self.concurrency + 1)
+            loop.set_default_executor(executor)
+            return await self.enrich(words, on_result)
+
+        return asyncio.run(run())
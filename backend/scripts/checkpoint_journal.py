@@ -0,0 +1,97 @@
+"""Append-only checkpointing for the word scripts' JSON outputs.
+
+enricher.py and translate_words.py used to checkpoint by rewriting their
+whole, growing JSON file every 50 or 100 words, so checkpoint I/O grew
+quadratically and a crash lost everything since the last checkpoint.
+CheckpointJournal keeps the JSON file as a snapshot and appends each new
+result to a JSONL journal next to it ("<name>.journal.jsonl"), flushed and
+fsync'd per line. load() returns the snapshot with the journal replayed on
+top; compact() folds everything back into the snapshot and empties the
+journal.
+
+A torn last line (a crash mid-append) is skipped on load. Compaction
+replaces the snapshot atomically before truncating the journal, so a crash
+in between only replays entries the snapshot already has.
+"""
+
+import json
+import os
+from pathlib import Path
+
+
+class CheckpointJournal:
+    """A {key: value} JSON snapshot plus an append-only journal of newer entries.
+
+    Attributes:
+        snapshot_path: The canonical JSON file.
+        journal_path: The JSONL journal; one {"k": key, "v": value} per line.
+        recovered: Entries replayed from the journal by the last load().
+    """
+
+    def __init__(self, snapshot_path, journal_path=None):
+        self.snapshot_path = Path(snapshot_path)
+        if journal_path is None:
+            journal_path = self.snapshot_path.with_name(
+                self.snapshot_path.stem + ".journal.jsonl")
+        self.journal_path = Path(journal_path)
+        self.recovered = 0
+        self._file = None
+
+    def load(self):
+        """Return the snapshot's entries updated with those in the journal."""
+        data = {}
+        if self.snapshot_path.exists():
+            data = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        self.recovered = 0
+        if self.journal_path.exists():
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn write from a crash
+                    data[record["k"]] = record["v"]
+                    self.recovered += 1
+        return data
+
+    def append(self, key, value):
+        """Durably record key = value before returning."""
+        if self._file is None:
+            self._file = open(self.journal_path, "a", encoding="utf-8")
+            if self._file.tell() and not self._ends_with_newline():
+                self._file.write("\n")  # end a torn line so the next one starts clean
+        line = json.dumps({"k": key, "v": value}, ensure_ascii=False)
+        self._file.write(line + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _ends_with_newline(self):
+        with open(self.journal_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def compact(self, data):
+        """Write data as the new snapshot and empty the journal.
+
+        data should be load()'s result with any later appends applied.
+        """
+        self.close()
+        tmp = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data, ensure_ascii=False, indent=2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
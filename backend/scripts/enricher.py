@@ -3,80 +3,76 @@
 Enrich raw words with English definitions and Chinese translations.
 Supports incremental processing and batch limits.
 
+Words are fetched concurrently (see async_enricher.py): --concurrency words
+are in flight at once, and --rate / --translate-rate cap the requests per
+second to the dictionary API and the translator. Each enriched word is
+appended to enriched_words.journal.jsonl as it completes and folded into
+enriched_words.json at the end (see checkpoint_journal.py), so an
+interrupted run loses nothing and the next run picks up where it stopped.
+Definitions are translated through the cache in translation_cache.py, so a
+definition any earlier run translated is not sent to the translator again.
+
 Usage:
   python enricher.py                  # enrich all new words
   python enricher.py --batch 500      # enrich up to 500 new words, then save
+  python enricher.py --concurrency 16 --rate 10
+  python enricher.py --translator fake --output /tmp/fake.json  # dry run
+  python enricher.py --compact        # fold a leftover journal into the JSON
 """
 
 import argparse
-import requests
-import json
-import re
-import time
+from functools import partial
 from pathlib import Path
-from deep_translator import GoogleTranslator
+
+from async_enricher import DICT_API, AsyncWordEnricher
+from checkpoint_journal import CheckpointJournal
+from translation_cache import BACKENDS, CACHE_PATH, CachedTranslator, TranslationCache, make_backend
 
 ROOT = Path(__file__).resolve().parents[2]
 RAW_WORDS = Path(__file__).parent / "raw_words.txt"
 OUTPUT_JSON = Path(__file__).parent / "enriched_words.json"
 
 
-class WordEnricher:
-    def __init__(self):
-        self.dict_api = "https://api.dictionaryapi.dev/api/v2/entries/en/"
-        self.translator = GoogleTranslator(source='en', target='zh-CN')
-
-    def get_definition(self, word):
-        try:
-            response = requests.get(f"{self.dict_api}{word}", timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                definition = data[0]['meanings'][0]['definitions'][0]['definition']
-                return definition
-            return None
-        except Exception as e:
-            print(f"  Error fetching definition for {word}: {e}")
-            return None
-
-    def enrich_words(self, word_list, save_fn=None, save_every=50):
-        """Enrich words. Optionally call save_fn every `save_every` words."""
-        enriched_bank = {}
-        for i, word in enumerate(word_list, 1):
-            word = word.upper()
-            print(f"  [{i}/{len(word_list)}] {word}...", flush=True)
-            definition = self.get_definition(word.lower())
-            translation = None
-            if definition:
-                try:
-                    translation = self.translator.translate(definition)
-                except Exception as e:
-                    print(f"  Error translating {word}: {e}")
-            if definition and translation:
-                censored_en = self.censor_word(definition, word)
-                censored_zh = self.censor_word(translation, word)
-                enriched_bank[word] = {
-                    "en": censored_en,
-                    "zh": censored_zh
-                }
-            time.sleep(0.5)
-            # Periodic save to avoid data loss
-            if save_fn and i % save_every == 0:
-                save_fn(enriched_bank)
-                print(f"  [checkpoint] saved after {i} words", flush=True)
-        return enriched_bank
-
-    def censor_word(self, text, word):
-        if not text:
-            return text
-        pattern = re.compile(re.escape(word), re.IGNORECASE)
-        return pattern.sub("__", text)
+def make_translator(backend="google", cache_path=CACHE_PATH):
+    """Return a cached translator; called once per worker thread."""
+    return CachedTranslator(make_backend(backend), TranslationCache(cache_path))
 
 
 def main():
     parser = argparse.ArgumentParser(description="Enrich words with definitions")
     parser.add_argument("--batch", type=int, default=0,
                         help="Max words to process (0 = all)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Words fetched at the same time")
+    parser.add_argument("--rate", type=float, default=5.0,
+                        help="Max dictionary API requests per second (0 = unlimited)")
+    parser.add_argument("--translate-rate", type=float, default=5.0,
+                        help="Max translation requests per second (0 = unlimited)")
+    parser.add_argument("--retries", type=int, default=4,
+                        help="Retries per request on connection errors, 429 and 5xx")
+    parser.add_argument("--dict-api", type=str, default=DICT_API,
+                        help="Dictionary API base URL (the word is appended)")
+    parser.add_argument("--translator", choices=sorted(BACKENDS), default="google",
+                        help="Translation backend")
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH,
+                        help="Translation cache file")
+    parser.add_argument("--output", type=Path, default=None,
+                        help=f"Enriched words JSON to update (default: {OUTPUT_JSON.name})")
+    parser.add_argument("--compact", action="store_true",
+                        help="Only fold the checkpoint journal into the JSON file")
     args = parser.parse_args()
+    if args.translator == "fake" and args.output is None:
+        parser.error("--translator fake needs --output, to keep placeholder "
+                     f"translations out of {OUTPUT_JSON.name}")
+    output = args.output or OUTPUT_JSON
+
+    journal = CheckpointJournal(output)
+    if args.compact:
+        existing = journal.load()
+        journal.compact(existing)
+        print(f"Compacted {journal.recovered} journal entries; "
+              f"{len(existing)} words in {output.name}")
+        return
 
     if not RAW_WORDS.exists():
         raise SystemExit(f"Missing {RAW_WORDS}")
@@ -91,11 +87,12 @@ def main():
             deduped.append(w)
     raw_words = deduped
 
-    # Load existing enriched data
-    existing = {}
-    if OUTPUT_JSON.exists():
-        existing = json.loads(OUTPUT_JSON.read_text(encoding="utf-8"))
+    # Load existing enriched data, including words journaled by an interrupted run
+    existing = journal.load()
+    if existing:
         print(f"Loaded {len(existing)} existing enriched words")
+    if journal.recovered:
+        print(f"  ({journal.recovered} recovered from {journal.journal_path.name})")
 
     new_words = [w for w in raw_words if w not in existing]
     print(f"Found {len(new_words)} new words to enrich")
@@ -105,20 +102,22 @@ def main():
         print(f"Batch mode: processing {len(new_words)} words")
 
     if not new_words:
+        if journal.recovered:
+            journal.compact(existing)
         print("Nothing to do.")
         return
 
-    def save_checkpoint(partial):
-        existing.update(partial)
-        OUTPUT_JSON.write_text(json.dumps(existing, ensure_ascii=False, indent=2), encoding="utf-8")
-
-    enricher = WordEnricher()
-    results = enricher.enrich_words(new_words, save_fn=save_checkpoint, save_every=50)
+    translator_factory = partial(make_translator, args.translator, args.cache)
+    enricher = AsyncWordEnricher(translator_factory, dict_api=args.dict_api,
+                                 concurrency=args.concurrency, rate=args.rate,
+                                 translate_rate=args.translate_rate, retries=args.retries)
+    with journal:
+        results = enricher.enrich_words(new_words, on_result=journal.append)
     existing.update(results)
     print(f"Enriched {len(results)} new words")
 
-    OUTPUT_JSON.write_text(json.dumps(existing, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"Saved {len(existing)} total words to {OUTPUT_JSON}")
+    journal.compact(existing)
+    print(f"Saved {len(existing)} total words to {output}")
 
 
 if __name__ == "__main__":
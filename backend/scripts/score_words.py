@@ -12,13 +12,18 @@ Usage:
 
 import json
 import re
+import sys
 import urllib.request
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[2]
 DICT_PATH = ROOT / "backend" / "dictionary" / "word_dictionary.json"
+BINARY_DICT_PATH = ROOT / "backend" / "dictionary" / "word_dictionary.bin"
 OUTPUT_PATH = Path(__file__).parent / "word_levels.json"
 CACHE_DIR = Path(__file__).parent / "exam_lists"
+sys.path.insert(0, str(ROOT / "backend" / "dictionary"))
+
+from binary_dictionary import open_binary_dictionary  # noqa: E402
 
 # Exam word list sources from KyleBing/english-vocabulary
 BASE_URL = "https://raw.githubusercontent.com/KyleBing/english-vocabulary/master"
@@ -171,11 +176,20 @@ def compute_level(word, exam_words):
     return min_level, sorted(matched)
 
 
-def main():
+def load_dictionary_words():
+    """Return the dictionary's words, from the binary dictionary when it is fresh."""
+    binary = open_binary_dictionary(BINARY_DICT_PATH, DICT_PATH)
+    if binary is not None:
+        with binary:
+            return list(binary)
     if not DICT_PATH.exists():
         raise FileNotFoundError(f"Dictionary not found: {DICT_PATH}")
     data = json.loads(DICT_PATH.read_text(encoding="utf-8"))
-    dict_words = list(data.get("words", {}).keys())
+    return list(data.get("words", {}).keys())
+
+
+def main():
+    dict_words = load_dictionary_words()
     print(f"Loaded {len(dict_words)} dictionary words")
 
     exam_words = download_all_exam_lists()
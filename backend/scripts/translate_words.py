@@ -3,25 +3,47 @@
 Translate dictionary words from English to Chinese (word-level).
 Builds a static JSON mapping { "APPLE": "苹果", ... } for use by build_dictionary.py.
 
-Supports incremental processing — skips already-translated words.
+Supports incremental processing — skips already-translated words. Each
+translation is appended to word_translations.journal.jsonl as soon as it is
+made and folded into word_translations.json at the end (see
+checkpoint_journal.py), so an interrupted run loses nothing.
+
+Words go through translation_cache.py: many words per backend request, and
+every translation is cached in translation_cache.sqlite, so re-running after
+a dictionary change only sends words no run has translated before.
 Run in terminal to watch progress:
   python translate_words.py               # translate all remaining words
   python translate_words.py --batch 500   # translate up to 500 new words
+  python translate_words.py --translator fake --output /tmp/fake.json  # dry run
+  python translate_words.py --compact     # fold a leftover journal into the JSON
 """
 
 import argparse
 import json
+import sys
 import time
 from pathlib import Path
-from deep_translator import GoogleTranslator
 
 ROOT = Path(__file__).resolve().parents[2]
 DICT_PATH = ROOT / "backend" / "dictionary" / "word_dictionary.json"
+BINARY_DICT_PATH = ROOT / "backend" / "dictionary" / "word_dictionary.bin"
 OUTPUT_PATH = Path(__file__).parent / "word_translations.json"
+REQUEST_DELAY = 0.3  # seconds between translation requests
+sys.path.insert(0, str(ROOT / "backend" / "dictionary"))
+
+from binary_dictionary import open_binary_dictionary  # noqa: E402
+from checkpoint_journal import CheckpointJournal  # noqa: E402
+from translation_cache import (  # noqa: E402
+    BACKENDS, CACHE_PATH, CachedTranslator, TranslationCache, batches, make_backend,
+)
 
 
 def load_words():
     """Load word list from the built dictionary."""
+    binary = open_binary_dictionary(BINARY_DICT_PATH, DICT_PATH)
+    if binary is not None:
+        with binary:
+            return list(binary)  # stored sorted
     if not DICT_PATH.exists():
         raise SystemExit(f"Dictionary not found: {DICT_PATH}\nRun build_dictionary.py first.")
     data = json.loads(DICT_PATH.read_text(encoding="utf-8"))
@@ -32,16 +54,37 @@ def main():
     parser = argparse.ArgumentParser(description="Translate words EN→ZH")
     parser.add_argument("--batch", type=int, default=0,
                         help="Max words to process (0 = all)")
+    parser.add_argument("--translator", choices=sorted(BACKENDS), default="google",
+                        help="Translation backend")
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH,
+                        help="Translation cache file")
+    parser.add_argument("--output", type=Path, default=None,
+                        help=f"Translations JSON to update (default: {OUTPUT_PATH.name})")
+    parser.add_argument("--compact", action="store_true",
+                        help="Only fold the checkpoint journal into the JSON file")
     args = parser.parse_args()
+    if args.translator == "fake" and args.output is None:
+        parser.error("--translator fake needs --output, to keep placeholder "
+                     f"translations out of {OUTPUT_PATH.name}")
+    output = args.output or OUTPUT_PATH
+
+    journal = CheckpointJournal(output)
+    if args.compact:
+        existing = journal.load()
+        journal.compact(existing)
+        print(f"Compacted {journal.recovered} journal entries; "
+              f"{len(existing)} translations in {output.name}")
+        return
 
     all_words = load_words()
     print(f"Dictionary has {len(all_words)} words")
 
-    # Load existing translations
-    existing = {}
-    if OUTPUT_PATH.exists():
-        existing = json.loads(OUTPUT_PATH.read_text(encoding="utf-8"))
+    # Load existing translations, including any journaled by an interrupted run
+    existing = journal.load()
+    if existing:
         print(f"Loaded {len(existing)} existing translations")
+    if journal.recovered:
+        print(f"  ({journal.recovered} recovered from {journal.journal_path.name})")
 
     new_words = [w for w in all_words if w not in existing]
     print(f"Found {len(new_words)} words to translate")
@@ -51,38 +94,44 @@ def main():
         print(f"Batch mode: processing {len(new_words)} words")
 
     if not new_words:
+        if journal.recovered:
+            journal.compact(existing)
         print("Nothing to do.")
         return
 
-    translator = GoogleTranslator(source='en', target='zh-CN')
+    translator = CachedTranslator(make_backend(args.translator), TranslationCache(args.cache))
     translated = 0
     failed = 0
-
-    for i, word in enumerate(new_words, 1):
-        try:
-            result = translator.translate(word.lower())
-            if result:
-                existing[word] = result
-                translated += 1
-                print(f"  [{i}/{len(new_words)}] {word} → {result}")
-            else:
-                failed += 1
-                print(f"  [{i}/{len(new_words)}] {word} → (empty)")
-        except Exception as e:
-            failed += 1
-            print(f"  [{i}/{len(new_words)}] {word} → ERROR: {e}")
-
-        # Checkpoint every 100 words
-        if i % 100 == 0:
-            OUTPUT_PATH.write_text(json.dumps(existing, ensure_ascii=False, indent=2), encoding="utf-8")
-            print(f"  [checkpoint] saved {len(existing)} translations")
-
-        time.sleep(0.3)
-
-    # Final save
-    OUTPUT_PATH.write_text(json.dumps(existing, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"\nDone: {translated} translated, {failed} failed")
-    print(f"Total: {len(existing)} translations in {OUTPUT_PATH.name}")
+    done = 0
+
+    with journal:
+        for chunk in batches(new_words, translator.batch_chars):
+            requests_before = translator.requests
+            try:
+                results = translator.translate_many([w.lower() for w in chunk])
+            except Exception as e:
+                results = {}
+                print(f"  ERROR translating {chunk[0]}..{chunk[-1]}: {e}")
+            for word in chunk:
+                done += 1
+                result = results.get(word.lower())
+                if result:
+                    existing[word] = result
+                    journal.append(word, result)
+                    translated += 1
+                    print(f"  [{done}/{len(new_words)}] {word} → {result}")
+                else:
+                    failed += 1
+                    print(f"  [{done}/{len(new_words)}] {word} → (empty)")
+            if translator.requests > requests_before:
+                time.sleep(REQUEST_DELAY)
+
+    # Fold the journal into the JSON file
+    journal.compact(existing)
+    translator.cache.close()
+    print(f"\nDone: {translated} translated, {failed} failed "
+          f"({translator.hits} from cache, {translator.requests} backend requests)")
+    print(f"Total: {len(existing)} translations in {output.name}")
 
 
 if __name__ == "__main__":
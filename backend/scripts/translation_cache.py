@@ -0,0 +1,206 @@
+"""Batched, cached translation shared by translate_words.py and enricher.py.
+
+Both scripts used to call GoogleTranslator.translate once per string, and
+every run re-translated strings an earlier run (or the other script) had
+already paid for. CachedTranslator sits in front of a pluggable backend:
+
+- Results are stored in a sqlite file keyed by the sha256 of (backend,
+  source language, target language, text), so a string is translated once
+  per backend and language pair, whichever script asks for it.
+- translate_many() looks up all strings at once and sends only the misses
+  to the backend, packed into batches of up to batch_chars characters.
+- A backend is any object with name, source, target and
+  translate_batch(texts) returning one translation per text. BACKENDS
+  maps --translator names to factories; "fake" needs no network and is
+  meant for dry runs, so the scripts only accept it with an explicit
+  --output file. Backends do not pace themselves; translate_words.py
+  sleeps between requests and enricher.py uses its TokenBucket.
+
+Empty translations are not cached, so they are retried on the next run.
+Backends raise TransientTranslationError for failures worth retrying
+(rate limiting, connection errors), so callers need not know which
+library a backend is built on.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+from pathlib import Path
+
+CACHE_PATH = Path(__file__).parent / "translation_cache.sqlite"
+BATCH_CHARS = 4500  # Google Translate rejects requests over 5000 characters
+LOOKUP_CHUNK = 500  # keys per SELECT, below sqlite's bound-parameter limit
+MARKER_CHARS = 8  # "[n] " prefix plus newline per text in a batch, n < 10000
+MARKED_LINE = re.compile(r"\s*\[\s*(\d+)\s*\]\s?(.*)")
+
+
+def cache_key(backend, text):
+    """Return the content address of text translated by backend."""
+    ident = [backend.name, backend.source, backend.target, text]
+    return hashlib.sha256(json.dumps(ident, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """Persistent {cache_key: translation} table in a sqlite file.
+
+    Each thread should open its own TranslationCache; sqlite serialises
+    writers across connections.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "key TEXT PRIMARY KEY, backend TEXT, source TEXT, target TEXT, "
+            "text TEXT, result TEXT)")
+        self.conn.commit()
+
+    def get_many(self, keys):
+        """Return {key: translation} for the keys that are cached."""
+        keys = list(keys)
+        found = {}
+        for i in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[i:i + LOOKUP_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key, result FROM translations WHERE key IN ({marks})", chunk)
+            found.update(rows)
+        return found
+
+    def put_many(self, backend, pairs):
+        """Store [(text, translation)] translated by backend."""
+        rows = [(cache_key(backend, text), backend.name, backend.source, backend.target,
+                 text, result) for text, result in pairs]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+class TransientTranslationError(Exception):
+    """A backend failure worth retrying (rate limited or request failed)."""
+
+
+class GoogleBackend:
+    """Google Translate through deep_translator, several strings per request.
+
+    A batch is sent as one newline-joined text with each line prefixed by
+    its position, "[n] ". The reply is only used if every line comes back
+    with its own marker, in order; otherwise (a string contained a newline,
+    or the service merged, split or reordered lines) the batch is redone
+    one string per request.
+    """
+
+    name = "google"
+
+    def __init__(self, source="en", target="zh-CN"):
+        from deep_translator import GoogleTranslator
+        from deep_translator.exceptions import RequestError, TooManyRequests
+        self.source = source
+        self.target = target
+        self.translator = GoogleTranslator(source=source, target=target)
+        self.transient_errors = (TooManyRequests, RequestError)
+
+    def _request(self, text):
+        try:
+            return self.translator.translate(text) or ""
+        except self.transient_errors as e:
+            raise TransientTranslationError(str(e)) from e
+
+    def translate_batch(self, texts):
+        if len(texts) > 1 and not any("\n" in text for text in texts):
+            marked = "\n".join(f"[{n}] {text}" for n, text in enumerate(texts))
+            lines = self._request(marked).strip().split("\n")
+            matches = [MARKED_LINE.fullmatch(line) for line in lines]
+            if (len(matches) == len(texts)
+                    and all(m and int(m.group(1)) == n for n, m in enumerate(matches))):
+                return [m.group(2).strip() for m in matches]
+        return [self._request(text) for text in texts]
+
+
+class FakeBackend:
+    """Offline backend that tags each text with the target language."""
+
+    name = "fake"
+
+    def __init__(self, source="en", target="zh-CN"):
+        self.source = source
+        self.target = target
+
+    def translate_batch(self, texts):
+        return [f"[{self.target}] {text}" for text in texts]
+
+
+BACKENDS = {
+    "google": GoogleBackend,
+    "fake": FakeBackend,
+}
+
+
+def make_backend(name, source="en", target="zh-CN"):
+    return BACKENDS[name](source=source, target=target)
+
+
+def batches(texts, batch_chars=BATCH_CHARS):
+    """Split texts into runs that fit in batch_chars once marked and newline-joined."""
+    batch, size = [], 0
+    for text in texts:
+        if batch and size + len(text) + MARKER_CHARS > batch_chars:
+            yield batch
+            batch, size = [], 0
+        batch.append(text)
+        size += len(text) + MARKER_CHARS
+    if batch:
+        yield batch
+
+
+class CachedTranslator:
+    """Translate through a TranslationCache, calling backend only for misses.
+
+    Attributes:
+        hits, misses: Strings served from the cache and sent to the backend.
+        requests: translate_batch() calls made.
+    """
+
+    def __init__(self, backend, cache, batch_chars=BATCH_CHARS):
+        self.backend = backend
+        self.cache = cache
+        self.batch_chars = batch_chars
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+
+    def cached_many(self, texts):
+        """Return {text: translation} for the texts that are cached."""
+        keys = {text: cache_key(self.backend, text) for text in dict.fromkeys(texts)}
+        found = self.cache.get_many(keys.values())
+        return {text: found[key] for text, key in keys.items() if key in found}
+
+    def translate_many(self, texts):
+        """Return {text: translation} for the distinct texts given.
+
+        Only cache misses reach the backend, one request per batch_chars of
+        text. Texts the backend returned nothing for are left out.
+        Translations are cached batch by batch, so an error part-way keeps
+        the batches already done.
+        """
+        results = self.cached_many(texts)
+        self.hits += len(results)
+
+        missing = [text for text in dict.fromkeys(texts) if text not in results]
+        for batch in batches(missing, self.batch_chars):
+            translated = self.backend.translate_batch(batch)
+            self.requests += 1
+            self.misses += len(batch)
+            pairs = [(text, result) for text, result in zip(batch, translated) if result]
+            self.cache.put_many(self.backend, pairs)
+            results.update(pairs)
+        return results
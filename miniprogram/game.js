@@ -1,6 +1,7 @@
 const { Theme, Font } = require('./js/theme')
 const { inRect } = require('./js/utils')
 const { State, loadProgress, saveProgress, loadPuzzlesIndex, loadExams } = require('./js/state')
+const { loadPackedPuzzle } = require('./js/puzzle_pack')
 const { calculateLayout } = require('./js/layout')
 const { createEngine } = require('./js/puzzle_engine')
 const { render } = require('./js/renderer')
@@ -41,6 +42,7 @@ function loadPuzzleByIndex(idx) {
   if (!entry) return null
   try {
     const fs = wx.getFileSystemManager()
+    if (entry.pack) return loadPackedPuzzle(fs, entry)
     const raw = fs.readFileSync(entry.file, 'utf8')
     return JSON.parse(raw)
   } catch (e) {
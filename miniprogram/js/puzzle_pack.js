@@ -0,0 +1,54 @@
+// Read puzzles out of pack files written by backend/generator/puzzle_pack.py
+
+// Pack path -> string table (record 0 of the pack)
+const stringTables = {}
+
+function readSlice(fs, path, position, length) {
+  return fs.readFileSync(path, 'utf8', position, length)
+}
+
+function loadStrings(fs, entry) {
+  let strings = stringTables[entry.pack]
+  if (!strings) {
+    strings = JSON.parse(readSlice(fs, entry.pack, 0, entry.strings))
+    stringTables[entry.pack] = strings
+  }
+  return strings
+}
+
+// Rebuild the puzzle JSON shape the engine expects from a packed record
+function decodePuzzle(record, strings) {
+  const cols = record.cols
+  const puzzle = {
+    id: record.id,
+    title: record.title,
+    rows: record.rows,
+    cols,
+    solution: record.solution.map(row => Array.from(row, ch => (ch === '#' ? null : ch))),
+    prefilled: {},
+    clues: {}
+  }
+  for (const level of Object.keys(record.prefilled)) {
+    puzzle.prefilled[level] = record.prefilled[level].map(k => [Math.floor(k / cols), k % cols])
+  }
+  for (const dir of Object.keys(record.clues)) {
+    puzzle.clues[dir] = record.clues[dir].map(([num, row, col, en, zh, level]) => {
+      const clue = { num, row, col, clue: { en: strings[en], zh: strings[zh] } }
+      if (level !== null) clue.level = level
+      return clue
+    })
+  }
+  for (const key of Object.keys(record)) {
+    if (!(key in puzzle) && key !== 'v') puzzle[key] = record[key]
+  }
+  return puzzle
+}
+
+// Load one puzzle of an index.json entry with "pack", "offset", "length", "strings"
+function loadPackedPuzzle(fs, entry) {
+  const strings = loadStrings(fs, entry)
+  const record = JSON.parse(readSlice(fs, entry.pack, entry.offset, entry.length))
+  return decodePuzzle(record, strings)
+}
+
+module.exports = { decodePuzzle, loadPackedPuzzle }